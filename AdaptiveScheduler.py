@@ -0,0 +1,93 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from RateLimiter import RateLimiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveScheduler:
+    """Paces requests from observed server behaviour instead of fixed sleeps
+
+    A token bucket caps the request rate. The rate creeps up towards max_rate while
+    responses are healthy, backs off when latency climbs well above the best seen,
+    and halves on throttling. Throttles and errors also pause all requests for an
+    exponential backoff with full jitter, or for the server's Retry-After when given.
+    max_rate defaults to twice the starting rate, so a healthy server earns a faster pace.
+    """
+
+    def __init__(self, rate: float = 1.0, max_rate: float = None, min_rate: float = 0.05, burst: int = 1,
+                 base_backoff: float = 2.0, max_backoff: float = 300.0, increase_step: float = 0.05):
+        self.max_rate = max_rate if max_rate is not None else 2 * rate
+        self.min_rate = min_rate
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.increase_step = increase_step
+        self.limiter = RateLimiter(rate, burst)
+        self.latency: Optional[float] = None
+        self.best_latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.limiter.rate
+
+    def wait(self):
+        """Block until the next request may start"""
+        while True:
+            with self.lock:
+                delay = self.paused_until - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        self.limiter.acquire()
+
+    def record_success(self, latency: float):
+        with self.lock:
+            self.consecutive_failures = 0
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+            if self.latency > 2 * self.best_latency:
+                rate = max(self.min_rate, self.rate * 0.8)
+            else:
+                rate = min(self.max_rate, self.rate + self.increase_step)
+            self.limiter.set_rate(rate)
+
+    def backoff_delay(self) -> float:
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** self.consecutive_failures))
+
+    def pause(self, delay: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    def record_throttle(self, retry_after: float = None) -> float:
+        """Slow down after a throttle signal (429/503, CAPTCHA); returns the pause applied"""
+        with self.lock:
+            self.consecutive_failures += 1
+            self.limiter.set_rate(max(self.min_rate, self.rate * 0.5))
+            delay = retry_after if retry_after is not None else self.backoff_delay()
+            self.pause(delay)
+            return delay
+
+    def record_error(self) -> float:
+        """Back off after a failed request without changing the steady-state rate"""
+        with self.lock:
+            self.consecutive_failures += 1
+            delay = self.backoff_delay()
+            self.pause(delay)
+            return delay
@@ -0,0 +1,125 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+from AdaptiveScheduler import AdaptiveScheduler
+
+
+class BrowserPage:
+    def __init__(self, url: str, title: str, page_source: str, cookies: List[dict], user_agent: str,
+                 latency: float):
+        self.url = url
+        self.title = title
+        self.page_source = page_source
+        self.cookies = cookies
+        self.user_agent = user_agent
+        self.latency = latency
+
+
+class BrowserWorker(threading.Thread):
+    """Owns one browser driver and profile directory, serving page loads from the pool's queue"""
+
+    def __init__(self, pool: 'BrowserPool', index: int):
+        super().__init__(name=f"browser-worker-{index}", daemon=True)
+        self.pool = pool
+        self.profile_dir = os.path.abspath(os.path.join(pool.profile_root, f"worker-{index}"))
+        self.driver = None
+        self.pages_served = 0
+
+    def run(self):
+        while True:
+            item = self.pool.queue.get()
+            if item is None:
+                break
+            url, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.load(url))
+            except Exception as e:
+                # A failed load may have left the browser in a bad state, start over with a fresh one
+                self.discard_driver()
+                future.set_exception(e)
+        self.discard_driver()
+
+    def healthy(self) -> bool:
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def load(self, url: str) -> BrowserPage:
+        if self.driver is not None and not self.healthy():
+            print(f"  {self.name}: browser unresponsive, restarting")
+            self.discard_driver()
+        if self.driver is None:
+            self.driver = self.pool.open_driver(self.profile_dir)
+
+        if self.pool.scheduler is not None:
+            self.pool.scheduler.wait()
+        started = time.monotonic()
+        self.driver.get(url)
+        latency = time.monotonic() - started
+        page = BrowserPage(url, self.driver.title, self.driver.page_source, self.driver.get_cookies(),
+                           self.driver.execute_script("return navigator.userAgent"), latency)
+
+        # Recycle the browser periodically to cap its memory growth
+        self.pages_served += 1
+        if self.pages_served >= self.pool.recycle_after:
+            self.discard_driver()
+        return page
+
+    def discard_driver(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+            self.pages_served = 0
+
+
+class BrowserPool:
+    """Pool of browser workers pulling page loads from a shared queue
+
+    Each worker runs its own driver on its own profile directory, so sessions and
+    cookies survive driver recycling. A shared scheduler keeps the combined request
+    rate of all workers fixed.
+    """
+
+    def __init__(self, open_driver: Callable[[str], object], size: int = 1, recycle_after: int = 50,
+                 scheduler: AdaptiveScheduler = None, profile_root: str = ".browser_profiles"):
+        self.open_driver = open_driver
+        self.size = size
+        self.recycle_after = recycle_after
+        self.scheduler = scheduler
+        self.profile_root = profile_root
+        self.queue = queue.Queue()
+        self.workers: List[BrowserWorker] = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if not self.workers:
+                self.workers = [BrowserWorker(self, index) for index in range(self.size)]
+                for worker in self.workers:
+                    worker.start()
+
+    def fetch(self, url: str) -> BrowserPage:
+        """Load url in the next free browser and wait for the result"""
+        self.start()
+        future = Future()
+        self.queue.put((url, future))
+        return future.result()
+
+    def close(self):
+        with self.lock:
+            for _ in self.workers:
+                self.queue.put(None)
+            for worker in self.workers:
+                worker.join()
+            self.workers = []
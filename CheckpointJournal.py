@@ -0,0 +1,74 @@
+import json
+import os
+from typing import Dict, List
+
+
+class CheckpointJournal:
+    """Append-only journal with one JSON record per completed pid
+
+    Records are flushed to the OS as they are written and fsync'd every
+    fsync_every records, so a crashed run can be replayed and resumed.
+    """
+
+    def __init__(self, filename: str = "SAIKURA_EXTRACTION_JOURNAL.jsonl", fsync_every: int = 10):
+        self.filename = filename
+        self.fsync_every = fsync_every
+        self.file = None
+        self.pending = 0
+
+    def replay(self) -> List[Dict]:
+        """Return the journalled records, ignoring a torn final line"""
+        records = []
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+        except FileNotFoundError:
+            pass
+        return records
+
+    def open(self, resume: bool = False):
+        """Open the journal for appending; a fresh run truncates any previous journal"""
+        if resume:
+            # Rewrite the replayable records so a torn final line is not appended to
+            records = self.replay()
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file = open(self.filename, 'a' if resume else 'w', encoding='utf-8')
+        self.pending = 0
+
+    def record(self, pid: int, status: str, data: Dict = None, content_hash: str = None):
+        entry = {"pid": pid, "status": status}
+        if data is not None:
+            entry["data"] = data
+        if content_hash is not None:
+            entry["content_hash"] = content_hash
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        if self.file and self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        if self.file:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+    def discard(self):
+        """Close and delete the journal once its run has been saved"""
+        self.close()
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
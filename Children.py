@@ -1,21 +1,37 @@
 from typing import List
 
+from lxml import etree
+
 from Gender import Gender
-from Person import Person
+from Person import CELLS, PID, Person
+
+CHILD_ROWS = etree.XPath("tr[position() > 1]")
+GENDER = etree.XPath("tr/td[position()=2]")
 
 
 class Children(List[Person]):
+    __slots__ = ()
+
     def __init__(self, node):
         super().__init__()
         self.parse(node)
 
     def parse(self, node):
-        children = node.xpath("tr[position() > 1]")
-        for child in children:
-            new_child = child.xpath("td/table")
-            if new_child is not None and len(new_child) > 0:
-                name = child.xpath("td[position()=2]/b")[0].text.strip()
-                child_person = Person(child, name)
-                gender = new_child[0].xpath("tr/td[position()=2]")[0].text
+        # One query per row: the name and the nested details table are read from its cells
+        for child in CHILD_ROWS(node):
+            cells = CELLS(child)
+            new_child = None
+            for cell in cells:
+                new_child = cell.find("table")
+                if new_child is not None:
+                    break
+            if new_child is not None:
+                name = cells[1].find("b").text.strip()
+                child_person = Person(child, name, rows=[])
+                link = cells[1].find(".//a[@href]")
+                match = PID.search(link.get("href")) if link is not None else None
+                if match:
+                    child_person.pid = int(match.group(1))
+                gender = GENDER(new_child)[0].text
                 child_person.gender = Gender.MALE if gender == "M" else Gender.FEMALE
                 self.append(child_person)
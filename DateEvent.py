@@ -1,4 +1,9 @@
+from typing import Dict
+
+
 class DateEvent:
+    __slots__ = ('date', 'location')
+
     def __init__(self, node):
         self.location: str = ''
         self.date: str = ''
@@ -7,3 +12,6 @@ class DateEvent:
     def parse(self, node):
         self.date = node[1].text.strip() if node[1].text is not None else ""
         self.location = node[2].text.strip() if node[2].text is not None else ""
+
+    def to_dict(self) -> Dict:
+        return {'date': self.date, 'location': self.location}
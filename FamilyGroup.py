@@ -1,15 +1,22 @@
 import json
-
-from Children import Children
-from Person import Person
+from typing import Dict, List, Optional
 
 
 class FamilyGroup:
+    # Members are referenced by pid; the Person records live in a FamilyTree
+    __slots__ = ('husband_pid', 'wife_pid', 'child_pids')
 
     def __init__(self):
-        self.wife: Person = None
-        self.husband: Person = None
-        self.children: Children = None
+        self.husband_pid: Optional[int] = None
+        self.wife_pid: Optional[int] = None
+        self.child_pids: List[int] = []
+
+    def to_dict(self) -> Dict:
+        return {
+            'husband_pid': self.husband_pid,
+            'wife_pid': self.wife_pid,
+            'child_pids': self.child_pids
+        }
 
     def toJson(self):
-        return json.dumps(self, default=lambda o: o.__dict__)
+        return json.dumps(self.to_dict(), ensure_ascii=False)
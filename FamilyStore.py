@@ -0,0 +1,172 @@
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from RecordStream import open_people
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS persons (
+    pid INTEGER PRIMARY KEY,
+    name TEXT,
+    name_key TEXT,
+    birth_date TEXT,
+    death_date TEXT,
+    gender TEXT,
+    father TEXT,
+    mother TEXT,
+    spouse TEXT,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS relationships (
+    pid INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    related_pid INTEGER,
+    related_name TEXT,
+    related_name_key TEXT
+);
+CREATE TABLE IF NOT EXISTS photos (
+    pid INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS persons_name_key ON persons (name_key);
+CREATE INDEX IF NOT EXISTS relationships_pid ON relationships (pid, position);
+CREATE INDEX IF NOT EXISTS relationships_related_pid ON relationships (related_pid);
+CREATE INDEX IF NOT EXISTS relationships_related_name_key ON relationships (related_name_key);
+CREATE INDEX IF NOT EXISTS photos_pid ON photos (pid, position);
+"""
+
+PERSON_COLUMNS = ('pid', 'name', 'birth_date', 'death_date', 'gender', 'father', 'mother', 'spouse')
+
+
+def name_key(name: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive lookup key for a name"""
+    if not name:
+        return None
+    return ' '.join(name.lower().split())
+
+
+class FamilyStore:
+    """SQLite-backed family database with indexed person, relationship and photo tables"""
+
+    def __init__(self, filename: str = "SAIKURA_RESILIENT_FAMILY_DATABASE.sqlite"):
+        self.filename = filename
+        self.db = sqlite3.connect(filename)
+        self.db.executescript(SCHEMA)
+
+    def upsert_people(self, records: Iterable[Tuple[int, Dict, Optional[str]]]):
+        """Insert or replace (pid, person, content_hash) records in a single transaction"""
+        with self.db:
+            for pid, person, content_hash in records:
+                self.db.execute("DELETE FROM relationships WHERE pid = ?", (pid,))
+                self.db.execute("DELETE FROM photos WHERE pid = ?", (pid,))
+                self.db.execute(
+                    "INSERT OR REPLACE INTO persons "
+                    "(pid, name, name_key, birth_date, death_date, gender, father, mother, spouse, content_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (pid, person.get('name'), name_key(person.get('name')), person.get('birth_date'),
+                     person.get('death_date'), person.get('gender'), person.get('father'), person.get('mother'),
+                     person.get('spouse'), content_hash))
+                self.db.executemany(
+                    "INSERT INTO relationships (pid, position, kind, related_pid, related_name, related_name_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    # Links crawled before roles were recorded are taken to be children, as before
+                    [(pid, position, link.get('role') or 'child', link.get('pid'), (link.get('name') or '').strip(),
+                      name_key(link.get('name')))
+                     for position, link in enumerate(person.get('children', []))])
+                self.db.executemany(
+                    "INSERT INTO photos (pid, position, url) VALUES (?, ?, ?)",
+                    [(pid, position, url) for position, url in enumerate(person.get('photos', []))])
+
+    def delete_people(self, pids: Iterable[int]):
+        with self.db:
+            for pid in pids:
+                for table in ("persons", "relationships", "photos"):
+                    self.db.execute(f"DELETE FROM {table} WHERE pid = ?", (pid,))
+
+    def pids(self) -> List[int]:
+        return [row[0] for row in self.db.execute("SELECT pid FROM persons ORDER BY pid")]
+
+    def count_people(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM persons").fetchone()[0]
+
+    def get_person(self, pid: int) -> Optional[Dict]:
+        """Rebuild a person record in the extractor's layout"""
+        row = self.db.execute(f"SELECT {', '.join(PERSON_COLUMNS)} FROM persons WHERE pid = ?", (pid,)).fetchone()
+        if row is None:
+            return None
+        person = dict(zip(PERSON_COLUMNS, row))
+        person['children'] = []
+        for related_pid, name, kind in self.db.execute(
+                "SELECT related_pid, related_name, kind FROM relationships WHERE pid = ? ORDER BY position", (pid,)):
+            link = {'name': name, 'pid': related_pid}
+            # 'child' is also the stand-in for links stored without a role
+            if kind != 'child':
+                link['role'] = kind
+            person['children'].append(link)
+        person['photos'] = [url for url, in self.db.execute(
+            "SELECT url FROM photos WHERE pid = ? ORDER BY position", (pid,))]
+        person['additional_info'] = {}
+        return person
+
+    def find_by_name(self, name: str) -> List[int]:
+        """Pids whose page name or any linked name matches, case- and whitespace-insensitively"""
+        key = name_key(name)
+        rows = self.db.execute(
+            "SELECT pid FROM persons WHERE name_key = ? "
+            "UNION SELECT related_pid FROM relationships WHERE related_name_key = ? AND related_pid IS NOT NULL",
+            (key, key))
+        return sorted(row[0] for row in rows)
+
+    def children_of(self, pid: int) -> List[Tuple[Optional[int], str]]:
+        return self.db.execute(
+            "SELECT related_pid, related_name FROM relationships WHERE pid = ? AND kind = 'child' ORDER BY position",
+            (pid,)).fetchall()
+
+    def parents_of(self, pid: int) -> List[int]:
+        return [row[0] for row in self.db.execute(
+            "SELECT DISTINCT pid FROM relationships WHERE related_pid = ? AND kind = 'child' ORDER BY pid", (pid,))]
+
+    def names_of(self, pid: int) -> List[str]:
+        """Every name a pid has been linked under"""
+        return [row[0] for row in self.db.execute(
+            "SELECT DISTINCT related_name FROM relationships WHERE related_pid = ? ORDER BY related_name", (pid,))]
+
+    def linked_names(self) -> Iterator[Tuple[Optional[int], str]]:
+        """Distinct (pid, name) pairs under which people are linked in any role, skipping paging links"""
+        return iter(self.db.execute(
+            "SELECT DISTINCT related_pid, related_name FROM relationships "
+            "WHERE related_name <> '' AND related_name <> 'more..'"))
+
+    def child_names_by_parent(self) -> Iterator[Tuple[int, List[str]]]:
+        """(parent pid, child names in page order) for every person with linked children"""
+        rows = self.db.execute(
+            "SELECT pid, related_name FROM relationships "
+            "WHERE kind = 'child' AND related_name <> '' AND related_name <> 'more..' ORDER BY pid, position")
+        current, names = None, []
+        for pid, name in rows:
+            if pid != current and names:
+                yield current, names
+                names = []
+            current = pid
+            names.append(name)
+        if names:
+            yield current, names
+
+    def close(self):
+        self.db.close()
+
+
+def open_store(basename: str = "SAIKURA_RESILIENT_FAMILY_DATABASE", follow: bool = False) -> FamilyStore:
+    """The SQLite database when present, else an in-memory store loaded from the record files
+
+    With follow and a crawl in progress, the store is loaded from its partial record file
+    as the crawl writes it, returning once the crawl finishes.
+    """
+    people = open_people(basename, follow=follow)
+    if not people.follow and os.path.exists(basename + ".sqlite"):
+        return FamilyStore(basename + ".sqlite")
+    store = FamilyStore(":memory:")
+    store.upsert_people((person['pid'], person, None) for person in people)
+    return store
@@ -0,0 +1,46 @@
+from typing import Dict, List
+
+from FamilyGroup import FamilyGroup
+from Person import Person
+
+
+class FamilyTree:
+    """People by pid and the family groups that reference them
+
+    Children are linked to their parents by resolve() once every page has been added,
+    so the order of the Husband, Wife and Children sections, within a page or across
+    pages, does not matter. People whose page gives no pid get negative local ids.
+    """
+
+    __slots__ = ('people', 'family_groups', 'last_local_id')
+
+    def __init__(self):
+        self.people: Dict[int, Person] = {}
+        self.family_groups: List[FamilyGroup] = []
+        self.last_local_id = 0
+
+    def add_person(self, person: Person) -> int:
+        """Register a person, merging details into an earlier record of the same pid"""
+        if person.pid is None:
+            self.last_local_id -= 1
+            person.pid = self.last_local_id
+        existing = self.people.get(person.pid)
+        if existing is None:
+            self.people[person.pid] = person
+        else:
+            for field in ('name', 'gender', 'born', 'died'):
+                if getattr(existing, field) is None:
+                    setattr(existing, field, getattr(person, field))
+        return person.pid
+
+    def resolve(self):
+        """Point each child at its group's parents by pid"""
+        for group in self.family_groups:
+            for child_pid in group.child_pids:
+                child = self.people.get(child_pid)
+                if child is None:
+                    continue
+                if group.husband_pid is not None:
+                    child.father_pid = group.husband_pid
+                if group.wife_pid is not None:
+                    child.mother_pid = group.wife_pid
@@ -0,0 +1,283 @@
+import re
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDENT = re.compile(r'\n[ \t]+')
+HEADER = re.compile(r'0 (?:@([^@\r\n]+)@ )?([^ \r\n]+)')
+
+
+class GedcomRecord:
+    """One GEDCOM line with its subordinate lines; CONT/CONC lines are folded into value"""
+    __slots__ = ('level', 'xref', 'tag', 'value', 'children')
+
+    def __init__(self, level: int, xref: Optional[str], tag: str, value: str):
+        self.level = level
+        self.xref = xref
+        self.tag = tag
+        self.value = value
+        self.children: List['GedcomRecord'] = []
+
+    def first(self, tag: str) -> Optional['GedcomRecord']:
+        for child in self.children:
+            if child.tag == tag:
+                return child
+        return None
+
+    def all(self, tag: str) -> Iterator['GedcomRecord']:
+        return (child for child in self.children if child.tag == tag)
+
+    def value_of(self, *path: str) -> Optional[str]:
+        """Value at a tag path below this record, e.g. value_of('BIRT', 'DATE')"""
+        record = self
+        for tag in path:
+            record = record.first(tag)
+            if record is None:
+                return None
+        return record.value
+
+
+def pointer(value: Optional[str]) -> Optional[str]:
+    """'@I12@' -> 'I12'"""
+    if value and len(value) > 2 and value[0] == '@' and value[-1] == '@':
+        return value[1:-1]
+    return None
+
+
+def split_line(line: str) -> Optional[Tuple[int, Optional[str], str, str]]:
+    """(level, xref, tag, value) of one GEDCOM line, or None when it is not one
+
+    The value is everything after the single space following the tag, so leading
+    spaces that matter to CONC continuations are kept.
+    """
+    level, _, rest = line.partition(' ')
+    if not level.isdigit() or not rest:
+        return None
+    xref = None
+    if rest[0] == '@':
+        token, _, rest = rest.partition(' ')
+        xref = pointer(token)
+    tag, _, value = rest.partition(' ')
+    tag = tag.rstrip()
+    if not tag:
+        return None
+    return int(level), xref, tag, value.rstrip('\r\n')
+
+
+def iter_record_texts(filename: str, block_size: int = 1 << 20) -> Iterator[str]:
+    """Stream the raw text of each level-0 record, beginning with its "0 ..." line
+
+    The file is read a block at a time and split on record boundaries, so memory is
+    bounded by the block size and the largest record rather than the file size.
+    """
+    with open(filename, 'r', encoding='utf-8-sig', errors='replace') as f:
+        rest = '\n'
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            block = rest + block
+            if '\n ' in block or '\n\t' in block:
+                block = INDENT.sub('\n', block)
+            # Keep the last, possibly incomplete, record for the next block
+            cut = block.rfind('\n0 ')
+            if cut <= 0:
+                rest = block
+                continue
+            rest = block[cut:]
+            for text in block[:cut].split('\n0 ')[1:]:
+                yield '0 ' + text
+        for text in rest.split('\n0 ')[1:]:
+            yield '0 ' + text
+
+
+def header(text: str) -> Tuple[Optional[str], str]:
+    """(xref, tag) of a record's "0 ..." line"""
+    match = HEADER.match(text)
+    return match.groups() if match else (None, '')
+
+
+def build_record(text: str) -> Optional[GedcomRecord]:
+    """Tokenize a record's lines into a GedcomRecord tree"""
+    stack: List[GedcomRecord] = []
+    for line in text.split('\n'):
+        token = split_line(line)
+        if token is None:
+            continue
+        level, xref, tag, value = token
+        if not stack:
+            stack.append(GedcomRecord(level, xref, tag, value))
+        elif tag == 'CONT' or tag == 'CONC':
+            parent = stack[level - 1] if 0 < level <= len(stack) else stack[-1]
+            parent.value += ('\n' + value) if tag == 'CONT' else value
+        elif level > 0:
+            record = GedcomRecord(level, xref, tag, value)
+            del stack[level:]
+            stack[-1].children.append(record)
+            stack.append(record)
+    return stack[0] if stack else None
+
+
+def iter_records(filename: str, tags: Iterable[str] = None) -> Iterator[GedcomRecord]:
+    """Stream the level-0 records of a GEDCOM file as GedcomRecord trees
+
+    With tags, records of other types (sources, notes, media, ...) are skipped without
+    being tokenized.
+    """
+    tags = set(tags) if tags is not None else None
+    for text in iter_record_texts(filename):
+        if tags is not None and header(text)[1] not in tags:
+            continue
+        record = build_record(text)
+        if record is not None:
+            yield record
+
+
+class GedcomTables:
+    """Individuals and families in integer-indexed columns
+
+    Indexes are handed out the first time an xref is seen, whether defined or only
+    referenced, so every pointer resolves to an index during the single read and
+    forward references are filled in when their record arrives. Person and family
+    links are then plain array lookups.
+    """
+
+    def __init__(self):
+        self.person_ids: List[str] = []
+        self.person_index: Dict[str, int] = {}
+        self.names: List[Optional[str]] = []
+        self.births: List[Optional[str]] = []
+        self.deaths: List[Optional[str]] = []
+        self.sexes: List[Optional[str]] = []
+        self.famc = array('l')                    # family as child, -1 when none
+        self.fams: List[List[int]] = []           # families as spouse
+        self.family_ids: List[str] = []
+        self.family_index: Dict[str, int] = {}
+        self.husbands = array('l')
+        self.wives = array('l')
+        self.family_children: List[List[int]] = []
+
+    def person(self, xref: str) -> int:
+        i = self.person_index.get(xref)
+        if i is None:
+            i = self.person_index[xref] = len(self.person_ids)
+            self.person_ids.append(xref)
+            self.names.append(None)
+            self.births.append(None)
+            self.deaths.append(None)
+            self.sexes.append(None)
+            self.famc.append(-1)
+            self.fams.append([])
+        return i
+
+    def family(self, xref: str) -> int:
+        i = self.family_index.get(xref)
+        if i is None:
+            i = self.family_index[xref] = len(self.family_ids)
+            self.family_ids.append(xref)
+            self.husbands.append(-1)
+            self.wives.append(-1)
+            self.family_children.append([])
+        return i
+
+    def add_individual(self, record: GedcomRecord):
+        i = self.person(record.xref)
+        for fact in record.children:
+            tag = fact.tag
+            if tag == 'NAME':
+                self.names[i] = fact.value.replace('/', '').strip()
+            elif tag == 'SEX':
+                self.sexes[i] = fact.value.strip()
+            elif tag == 'BIRT' or tag == 'DEAT':
+                date = fact.first('DATE')
+                if date is not None:
+                    (self.births if tag == 'BIRT' else self.deaths)[i] = date.value.strip()
+            elif tag == 'FAMC' or tag == 'FAMS':
+                target = pointer(fact.value.strip())
+                if target is None:
+                    continue
+                family = self.family_index.get(target)
+                if family is None:
+                    family = self.family(target)
+                if tag == 'FAMS':
+                    self.fams[i].append(family)
+                else:
+                    self.famc[i] = family
+
+    def add_family(self, record: GedcomRecord):
+        f = self.family(record.xref)
+        for fact in record.children:
+            tag = fact.tag
+            if tag != 'CHIL' and tag != 'HUSB' and tag != 'WIFE':
+                continue
+            target = pointer(fact.value.strip())
+            if target is None:
+                continue
+            person = self.person_index.get(target)
+            if person is None:
+                person = self.person(target)
+            if tag == 'CHIL':
+                self.family_children[f].append(person)
+            elif tag == 'HUSB':
+                self.husbands[f] = person
+            else:
+                self.wives[f] = person
+
+    def father(self, i: int) -> int:
+        family = self.famc[i]
+        return self.husbands[family] if family != -1 else -1
+
+    def mother(self, i: int) -> int:
+        family = self.famc[i]
+        return self.wives[family] if family != -1 else -1
+
+    def children(self, i: int) -> List[int]:
+        fams = self.fams[i]
+        if len(fams) == 1:
+            return self.family_children[fams[0]]
+        return [child for family in fams for child in self.family_children[family]]
+
+    def to_people(self) -> Dict[str, Dict]:
+        """Named individuals by id, parents and children given by name"""
+        names, famc, husbands, wives = self.names, self.famc, self.husbands, self.wives
+        people = {}
+        for i, xref in enumerate(self.person_ids):
+            if not names[i]:
+                continue
+            family = famc[i]
+            father = husbands[family] if family != -1 else -1
+            mother = wives[family] if family != -1 else -1
+            people[xref] = {
+                'id': xref,
+                'name': names[i],
+                'birth': self.births[i],
+                'death': self.deaths[i],
+                'sex': self.sexes[i],
+                'famc': self.family_ids[family] if family != -1 else None,
+                'fams': [self.family_ids[family] for family in self.fams[i]],
+                'father': names[father] if father != -1 else None,
+                'mother': names[mother] if mother != -1 else None,
+                'children': [names[child] for child in self.children(i) if names[child]]
+            }
+        return people
+
+
+def load_gedcom(filename: str) -> GedcomTables:
+    """Read individuals and families into GedcomTables in one pass over the file
+
+    Only INDI and FAM records are tokenized into GedcomRecord trees (with CONT/CONC
+    lines folded into their values); other records are only split off.
+    """
+    tables = GedcomTables()
+    for record in iter_records(filename, ('INDI', 'FAM')):
+        if not record.xref:
+            continue
+        if record.tag == 'INDI':
+            tables.add_individual(record)
+        else:
+            tables.add_family(record)
+    return tables
+
+
+def parse_gedcom(filename: str) -> Dict[str, Dict]:
+    """Individuals by id with name, dates, sex and resolved parent/children names"""
+    return load_gedcom(filename).to_people()
@@ -0,0 +1,367 @@
+import html
+import json
+import os
+import re
+from typing import IO, Iterable, Optional, Sequence, Tuple
+
+STYLE = """\
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        h1 {
+            color: #2c3e50;
+            border-bottom: 3px solid #3498db;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #34495e;
+            margin-top: 30px;
+            border-bottom: 2px solid #95a5a6;
+            padding-bottom: 8px;
+        }
+        .summary {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 25px;
+            border-radius: 10px;
+            margin: 20px 0;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }
+        .summary h2 {
+            color: white;
+            border-bottom: 2px solid rgba(255,255,255,0.3);
+            margin-top: 0;
+        }
+        .stat-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 15px;
+            margin-top: 15px;
+        }
+        .stat-box {
+            background: rgba(255,255,255,0.2);
+            padding: 15px;
+            border-radius: 8px;
+            text-align: center;
+        }
+        .stat-number {
+            font-size: 2em;
+            font-weight: bold;
+            display: block;
+        }
+        .stat-label {
+            font-size: 0.9em;
+            opacity: 0.95;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+            background: white;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            border-radius: 8px;
+            overflow: hidden;
+        }
+        th {
+            background: #3498db;
+            color: white;
+            padding: 12px;
+            text-align: left;
+            font-weight: 600;
+        }
+        td {
+            padding: 10px 12px;
+            border-bottom: 1px solid #ecf0f1;
+        }
+        tr:hover {
+            background-color: #f8f9fa;
+        }
+        .match-exact {
+            background-color: #d4edda;
+        }
+        .match-fuzzy {
+            background-color: #fff3cd;
+        }
+        .no-match {
+            background-color: #f8d7da;
+        }
+        .similarity {
+            font-weight: bold;
+            color: #e67e22;
+        }
+        .section {
+            background: white;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .filter-box {
+            background: #ecf0f1;
+            padding: 15px;
+            border-radius: 8px;
+            margin: 15px 0;
+        }
+        input[type="text"] {
+            width: 100%;
+            padding: 10px;
+            border: 2px solid #bdc3c7;
+            border-radius: 5px;
+            font-size: 14px;
+        }
+        input[type="text"]:focus {
+            outline: none;
+            border-color: #3498db;
+        }
+        .badge {
+            display: inline-block;
+            padding: 4px 8px;
+            border-radius: 4px;
+            font-size: 0.85em;
+            font-weight: 600;
+        }
+        .badge-success {
+            background-color: #28a745;
+            color: white;
+        }
+        .badge-warning {
+            background-color: #ffc107;
+            color: #000;
+        }
+        .badge-danger {
+            background-color: #dc3545;
+            color: white;
+        }
+        .pager {
+            display: flex;
+            gap: 10px;
+            align-items: center;
+            justify-content: flex-end;
+        }
+    </style>
+"""
+
+SCRIPT = """\
+    <script>
+        function filterTable(tableId, filterId) {
+            const input = document.getElementById(filterId);
+            const filter = input.value.toLowerCase();
+            const table = document.getElementById(tableId);
+            const rows = table.getElementsByTagName('tr');
+
+            for (let i = 1; i < rows.length; i++) {
+                const row = rows[i];
+                const text = row.textContent.toLowerCase();
+                row.style.display = text.includes(filter) ? '' : 'none';
+            }
+        }
+    </script>
+"""
+
+# Paged mode: rows live in REPORT_DATA (loaded from the sidecar) as [row class, search
+# text, cell HTML...]; filtering scans the prebuilt search strings and only one page of
+# rows is ever in the DOM
+PAGED_SCRIPT = """\
+    <script>
+        const PAGE_SIZE = %d;
+        const views = {};
+
+        function renderTable(tableId) {
+            const view = views[tableId];
+            const start = view.page * PAGE_SIZE;
+            document.getElementById(tableId).tBodies[0].innerHTML = view.rows
+                .slice(start, start + PAGE_SIZE)
+                .map(row => (row[0] ? `<tr class="${row[0]}">` : '<tr>')
+                            + row.slice(2).map(c => `<td>${c}</td>`).join('') + '</tr>')
+                .join('');
+            const pages = Math.max(1, Math.ceil(view.rows.length / PAGE_SIZE));
+            document.getElementById(tableId + 'Pager').innerHTML =
+                `<button onclick="showPage('${tableId}', ${view.page - 1})" ${view.page > 0 ? '' : 'disabled'}>&lsaquo; Prev</button>`
+                + `<span>Page ${view.page + 1} of ${pages} (${view.rows.length} rows)</span>`
+                + `<button onclick="showPage('${tableId}', ${view.page + 1})" ${view.page + 1 < pages ? '' : 'disabled'}>Next &rsaquo;</button>`;
+        }
+
+        function showPage(tableId, page) {
+            views[tableId].page = page;
+            renderTable(tableId);
+        }
+
+        function filterTable(tableId, filterId) {
+            const filter = document.getElementById(filterId).value.toLowerCase();
+            const rows = REPORT_DATA[tableId];
+            views[tableId] = {rows: filter ? rows.filter(row => row[1].includes(filter)) : rows, page: 0};
+            renderTable(tableId);
+        }
+
+        for (const tableId in REPORT_DATA) {
+            views[tableId] = {rows: REPORT_DATA[tableId], page: 0};
+            renderTable(tableId);
+        }
+    </script>
+"""
+TAGS = re.compile(r'<[^>]*>')
+
+
+class Markup(str):
+    """Cell content that is already HTML and is written without escaping"""
+    __slots__ = ()
+
+
+def cell(value) -> str:
+    """HTML for one table cell's content; plain values are escaped"""
+    if isinstance(value, Markup):
+        return value
+    return html.escape(str(value), quote=False)
+
+
+def search_text(value) -> str:
+    """Lowercased visible text of a cell, as matched by the report's search boxes"""
+    if isinstance(value, Markup):
+        return html.unescape(TAGS.sub('', value)).lower()
+    return str(value).lower()
+
+
+def badge(kind: str, label: str) -> Markup:
+    return Markup(f'<span class="badge badge-{kind}">{html.escape(label)}</span>')
+
+
+class HtmlReport:
+    """Writes an HTML report section by section to a buffered file
+
+    Rows go straight to the file as they are produced, so rendering time is linear in
+    the number of rows and memory does not grow with the size of the document.
+
+    With data_filename the report is paged: rows are streamed to that sidecar script
+    instead of the page, and the browser renders page_size rows of a table at a time.
+    The sidecar is a script assigning REPORT_DATA rather than bare JSON so the report
+    still opens from the local filesystem, where fetch() is blocked.
+    """
+
+    def __init__(self, filename: str, title: str, buffer_size: int = 1 << 16,
+                 data_filename: Optional[str] = None, page_size: int = 100):
+        self.filename = filename
+        self.data_filename = data_filename
+        self.page_size = page_size
+        self.f: IO[str] = open(filename, 'w', encoding='utf-8', buffering=buffer_size)
+        self.data: Optional[IO[str]] = None
+        self.table_id: Optional[str] = None
+        self.first_table = True
+        self.first_row = True
+        if data_filename:
+            self.data = open(data_filename, 'w', encoding='utf-8', buffering=buffer_size)
+            self.data.write("const REPORT_DATA = {")
+        self.f.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(title)}</title>
+{STYLE}</head>
+<body>
+""")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+        if self.data:
+            self.data.close()
+
+    def heading(self, text: str):
+        self.f.write(f"    <h1>{html.escape(text)}</h1>\n")
+
+    def summary(self, stats: Iterable[Tuple[object, str]], title: str = "Executive Summary"):
+        """Grid of (number, label) boxes"""
+        write = self.f.write
+        write(f"""
+    <div class="summary">
+        <h2>{html.escape(title)}</h2>
+        <div class="stat-grid">
+""")
+        for number, label in stats:
+            write(f"""            <div class="stat-box">
+                <span class="stat-number">{cell(number)}</span>
+                <span class="stat-label">{cell(label)}</span>
+            </div>
+""")
+        write("""        </div>
+    </div>
+""")
+
+    def begin_table(self, table_id: str, title: str, columns: Sequence[str],
+                    description: Optional[str] = None, placeholder: str = "Search..."):
+        """Open a section holding a filterable table; follow with rows and end_table()"""
+        write = self.f.write
+        filter_id = f"{table_id}Filter"
+        self.table_id = table_id
+        write(f"""
+    <div class="section">
+        <h2>{html.escape(title)}</h2>
+""")
+        if description:
+            write(f"        <p>{html.escape(description)}</p>\n")
+        write(f"""        <div class="filter-box">
+            <input type="text" id="{filter_id}" onkeyup="filterTable('{table_id}', '{filter_id}')"
+                   placeholder="{html.escape(placeholder)}">
+        </div>
+        <table id="{table_id}">
+            <thead>
+                <tr>
+""")
+        for column in columns:
+            write(f"                    <th>{html.escape(column)}</th>\n")
+        write("""                </tr>
+            </thead>
+            <tbody>
+""")
+        if self.data:
+            self.data.write(("\n" if self.first_table else "],\n") + f"{json.dumps(table_id)}: [")
+            self.first_table = False
+            self.first_row = True
+
+    def row(self, cells: Iterable, row_class: Optional[str] = None):
+        if self.data:
+            cells = list(cells)
+            entry = [row_class or '', ' '.join(search_text(value) for value in cells)]
+            entry.extend(cell(value) for value in cells)
+            self.data.write(("\n" if self.first_row else ",\n") + json.dumps(entry, ensure_ascii=False))
+            self.first_row = False
+            return
+        attrs = f' class="{row_class}"' if row_class else ''
+        self.f.write(f"                <tr{attrs}>"
+                     + ''.join(f"<td>{cell(value)}</td>" for value in cells)
+                     + "</tr>\n")
+
+    def end_table(self):
+        self.f.write("""            </tbody>
+        </table>
+""")
+        if self.data:
+            self.f.write(f'        <div class="pager" id="{self.table_id}Pager"></div>\n')
+        self.f.write("    </div>\n")
+
+    def finish(self, footer_lines: Iterable[str]):
+        """Write the filter script and a footer, then close the document"""
+        write = self.f.write
+        if self.data:
+            self.data.write("]\n};\n" if not self.first_table else "};\n")
+            src = html.escape(os.path.basename(self.data_filename))
+            write(f'\n    <script src="{src}"></script>\n' + PAGED_SCRIPT % self.page_size)
+        else:
+            write("\n" + SCRIPT)
+        write("""
+    <div style="margin-top: 40px; padding: 20px; background: #ecf0f1; border-radius: 8px; text-align: center;">
+""")
+        for line in footer_lines:
+            write(f"        <p>{cell(line)}</p>\n")
+        write("""    </div>
+</body>
+</html>
+""")
@@ -1,11 +1,21 @@
+from typing import Dict, Optional
+
 from DateEvent import DateEvent
-from Person import Person
 
 
 class Marriage:
+    __slots__ = ('married', 'divorced', 'husband_pid', 'wife_pid')
 
-    def __init__(self, married: DateEvent, husband: Person, wife: Person):
+    def __init__(self, married: DateEvent, husband_pid: Optional[int], wife_pid: Optional[int]):
         self.married = married
-        self.husband = husband
-        self.wife = wife
-        self.divorced: DateEvent
+        self.husband_pid = husband_pid
+        self.wife_pid = wife_pid
+        self.divorced: DateEvent = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'married': self.married.to_dict() if self.married is not None else None,
+            'divorced': self.divorced.to_dict() if self.divorced is not None else None,
+            'husband_pid': self.husband_pid,
+            'wife_pid': self.wife_pid
+        }
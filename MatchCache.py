@@ -0,0 +1,119 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+class MatchCache:
+    """Persistent pairwise name similarity scores and per-query match decisions
+
+    Scores are keyed by matcher version and the (query, target) pair of normalized
+    names, so a re-run only scores pairs involving names it has not seen before. A
+    pair rejected on its quick_ratio is stored as an upper bound rather than an exact
+    score, so it is not rescored unless a lower threshold needs the exact ratio.
+    Decisions (the matches found for a query against a given target set) are stored
+    as well, so an unchanged query against unchanged targets is not matched again.
+
+    Rows are read from SQLite as they are needed through a bounded LRU of
+    max_entries; new rows are written back in batches of flush_every.
+    """
+
+    def __init__(self, version: str, filename: str = ".match_cache.sqlite", max_entries: int = 100000,
+                 flush_every: int = 10000):
+        self.filename = filename
+        self.version = version
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.db = sqlite3.connect(filename)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS pair_scores (
+                matcher TEXT NOT NULL,
+                query TEXT NOT NULL,
+                target TEXT NOT NULL,
+                score REAL NOT NULL,
+                exact INTEGER NOT NULL,
+                PRIMARY KEY (matcher, query, target)
+            );
+            CREATE TABLE IF NOT EXISTS decisions (
+                matcher TEXT NOT NULL,
+                targets TEXT NOT NULL,
+                query TEXT NOT NULL,
+                threshold REAL NOT NULL,
+                k INTEGER NOT NULL,
+                matches TEXT NOT NULL,
+                PRIMARY KEY (matcher, targets, query, threshold, k)
+            );""")
+        self.db.commit()
+        self.recent: OrderedDict = OrderedDict()
+        self.new_scores: List[Tuple[str, str, float, bool]] = []
+        self.new_decisions: List[Tuple[str, str, float, int, str]] = []
+
+    def remember(self, key, value):
+        self.recent[key] = value
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.max_entries:
+            self.recent.popitem(last=False)
+
+    def lookup(self, key, sql: str, params: Tuple):
+        if key in self.recent:
+            self.recent.move_to_end(key)
+            return self.recent[key]
+        row = self.db.execute(sql, (self.version,) + params).fetchone()
+        if row is not None:
+            self.remember(key, row)
+        return row
+
+    def get(self, pair: Tuple[str, str]) -> Optional[Tuple[float, bool]]:
+        """(score, exact) for a pair; a score that is not exact is an upper bound on the ratio"""
+        row = self.lookup(('score',) + pair,
+                          "SELECT score, exact FROM pair_scores WHERE matcher = ? AND query = ? AND target = ?",
+                          pair)
+        return None if row is None else (row[0], bool(row[1]))
+
+    def record(self, pair: Tuple[str, str], score: float, exact: bool = True):
+        self.remember(('score',) + pair, (score, exact))
+        self.new_scores.append((pair[0], pair[1], score, exact))
+        self.pending()
+
+    def decision(self, targets: str, query: str, threshold: float, k: int) -> Optional[List[Tuple[str, float]]]:
+        """(normalized target, score) matches previously found for query against targets"""
+        key = ('decision', targets, query, threshold, k)
+        row = self.lookup(key, "SELECT matches FROM decisions WHERE matcher = ? AND targets = ? AND query = ? "
+                               "AND threshold = ? AND k = ?", key[1:])
+        return None if row is None else [tuple(match) for match in json.loads(row[0])]
+
+    def record_decision(self, targets: str, query: str, threshold: float, k: int,
+                        matches: List[Tuple[str, float]]):
+        encoded = json.dumps(matches, ensure_ascii=False)
+        self.remember(('decision', targets, query, threshold, k), (encoded,))
+        self.new_decisions.append((targets, query, threshold, k, encoded))
+        self.pending()
+
+    def pending(self):
+        if len(self.new_scores) + len(self.new_decisions) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.new_scores and not self.new_decisions:
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO pair_scores (matcher, query, target, score, exact) VALUES (?, ?, ?, ?, ?)",
+                ((self.version, query, target, score, int(exact))
+                 for query, target, score, exact in self.new_scores))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO decisions (matcher, targets, query, threshold, k, matches) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((self.version,) + decision for decision in self.new_decisions))
+        self.new_scores = []
+        self.new_decisions = []
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,105 @@
+import hashlib
+from difflib import SequenceMatcher
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from NameNormalizer import normalize_name
+
+
+def ngrams(text: str, n: int) -> set:
+    padded = f"^{text}$"
+    return {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+
+class NameMatcher:
+    """Fuzzy name lookup over a fixed set of names
+
+    Names are normalized once and indexed by character n-grams. A query is only scored
+    against names sharing an n-gram with it, and candidates whose length ratio or
+    quick_ratio cannot reach the threshold are skipped before the full SequenceMatcher
+    ratio is computed.
+
+    scores, e.g. a MatchCache, supplies and records ratios by (query, target)
+    normalized pair, including the quick_ratio upper bound of rejected pairs, and the
+    decision for each query against this set of names, so work done on an earlier run
+    is not repeated.
+    """
+
+    VERSION = "sequence-1"
+
+    def __init__(self, names: Iterable[str], normalize: Callable[[str], str] = normalize_name, n: int = 2,
+                 scores=None):
+        self.normalize = normalize
+        self.scores = scores
+        self.n = n
+        self.names: List[str] = []      # first original name for each distinct normalized form
+        self.normalized: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.index: Dict[str, int] = {}
+        for name in names:
+            norm = normalize(name) or ""
+            if norm in self.index:
+                continue
+            self.index[norm] = len(self.names)
+            self.names.append(name)
+            self.normalized.append(norm)
+            for gram in ngrams(norm, n):
+                self.postings.setdefault(gram, []).append(self.index[norm])
+        # Identifies the target set for cached decisions, independent of input order
+        self.digest = hashlib.sha256("\n".join(sorted(self.normalized)).encode('utf-8')).hexdigest()
+
+    def candidates(self, norm: str) -> Dict[int, int]:
+        """Indexes of names sharing at least one n-gram with norm, with the shared count"""
+        shared: Dict[int, int] = {}
+        for gram in ngrams(norm, self.n):
+            for i in self.postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        return shared
+
+    def match(self, name: str, threshold: float = 0.75, k: int = 1) -> List[Tuple[str, float]]:
+        """Up to k (name, ratio) pairs with ratio >= threshold, best first, earlier names winning ties"""
+        norm = self.normalize(name) or ""
+        if self.scores is not None:
+            decided = self.scores.decision(self.digest, norm, threshold, k)
+            if decided is not None:
+                return [(self.names[self.index[other]], ratio) for other, ratio in decided]
+        # The query is always the first sequence: ratio() is not symmetric
+        matcher = SequenceMatcher(None)
+        matcher.set_seq1(norm)
+        scored: List[Tuple[float, int]] = []
+        bound = threshold
+        # Most shared n-grams first so good matches raise the bound early
+        for i, _ in sorted(self.candidates(norm).items(), key=lambda item: (-item[1], item[0])):
+            other = self.normalized[i]
+            total = len(norm) + len(other)
+            if total == 0 or 2.0 * min(len(norm), len(other)) / total < bound:
+                continue
+            cached = self.scores.get((norm, other)) if self.scores is not None else None
+            if cached is not None and not cached[1] and cached[0] < bound:
+                continue    # rejected before on a quick_ratio that is still too low
+            ratio = cached[0] if cached is not None and cached[1] else None
+            if ratio is None:
+                matcher.set_seq2(other)
+                quick = matcher.quick_ratio()
+                if quick < bound:
+                    if self.scores is not None:
+                        self.scores.record((norm, other), quick, exact=False)
+                    continue
+                ratio = matcher.ratio()
+                if self.scores is not None:
+                    self.scores.record((norm, other), ratio)
+            if ratio < bound:
+                continue
+            scored.append((ratio, i))
+            if len(scored) >= k:
+                scored.sort(key=lambda item: (-item[0], item[1]))
+                del scored[k:]
+                bound = max(bound, scored[-1][0])
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        if self.scores is not None:
+            self.scores.record_decision(self.digest, norm, threshold, k,
+                                        [(self.normalized[i], ratio) for ratio, i in scored[:k]])
+        return [(self.names[i], ratio) for ratio, i in scored[:k]]
+
+    def best_match(self, name: str, threshold: float = 0.75) -> Optional[Tuple[str, float]]:
+        matches = self.match(name, threshold, k=1)
+        return matches[0] if matches else None
@@ -0,0 +1,56 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+# Long vowels are spelled doubled or plain in romanized names (Saikuraa/Saikura,
+# Yoosuf/Yusuf, Aaminath/Aminath); fold each to its single-letter spelling
+VOWEL_VARIANTS = ((re.compile(r'a{2,}'), 'a'), (re.compile(r'e{2,}|i{2,}'), 'i'),
+                  (re.compile(r'o{2,}|u{2,}'), 'u'))
+PUNCTUATION = str.maketrans('', '', '.()')
+
+
+def fold_latin_accents(name: str) -> str:
+    """Drop combining marks from Latin letters only
+
+    Marks on other scripts are part of the spelling (Thaana fili, Arabic harakat)
+    and are kept.
+    """
+    folded = []
+    latin = False
+    for c in unicodedata.normalize('NFKD', name):
+        if unicodedata.category(c) == 'Mn':
+            if latin:
+                continue
+        else:
+            latin = unicodedata.name(c, '').startswith('LATIN ')
+        folded.append(c)
+    return unicodedata.normalize('NFC', ''.join(folded))
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_name(name: Optional[str]) -> str:
+    """Comparison form of a name: Latin accents and case folded, "Last, First" reordered,
+    punctuation and whitespace runs collapsed, long-vowel spellings unified
+
+    Results are memoized, so each distinct name is normalized once per process.
+    """
+    if not name:
+        return ""
+    name = fold_latin_accents(name).casefold().strip()
+
+    # Handle "Lastname, Firstname" format - convert to "firstname lastname"
+    if ',' in name:
+        parts = name.split(',')
+        if len(parts) == 2:
+            name = f"{parts[1].strip()} {parts[0].strip()}"
+
+    name = name.translate(PUNCTUATION)
+    for pattern, replacement in VOWEL_VARIANTS:
+        name = pattern.sub(replacement, name)
+    return ' '.join(name.split())
+
+
+def normalize_many(names: Iterable[Optional[str]]) -> Dict[Optional[str], str]:
+    """Normalized form of each distinct name"""
+    return {name: normalize_name(name) for name in set(names)}
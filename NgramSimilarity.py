@@ -0,0 +1,82 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from NameMatcher import ngrams
+from NameNormalizer import normalize_name
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional: only needed for the vectorized backend
+    np = None
+    sparse = None
+
+
+class NgramSimilarity:
+    """Cosine similarity of character n-gram vectors, scored in batched sparse matrix products
+
+    Target names are encoded once as L2-normalized binary n-gram vectors. Queries are
+    encoded the same way in batches and multiplied against the target matrix, so a
+    batch of names is scored against every target in one operation.
+    """
+
+    def __init__(self, names: Iterable[str], normalize: Callable[[str], str] = normalize_name, n: int = 3,
+                 batch_size: int = 1024):
+        if sparse is None:
+            raise ImportError("NgramSimilarity needs numpy and scipy (pip install numpy scipy)")
+        self.normalize = normalize
+        self.n = n
+        self.batch_size = batch_size
+        self.names: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        seen = set()
+        normalized = []
+        for name in names:
+            norm = normalize(name) or ""
+            if norm in seen:
+                continue
+            seen.add(norm)
+            self.names.append(name)
+            normalized.append(norm)
+        for norm in normalized:
+            for gram in ngrams(norm, n):
+                self.vocabulary.setdefault(gram, len(self.vocabulary))
+        self.targets = self.vectorize(normalized).T.tocsr()
+
+    def vectorize(self, normalized: List[str]):
+        """Rows of L2-normalized n-gram indicators; n-grams unknown to the targets are dropped"""
+        rows, columns = [], []
+        for row, norm in enumerate(normalized):
+            for gram in ngrams(norm, self.n):
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)),
+                                   shape=(len(normalized), len(self.vocabulary)))
+        # Norms come from the full n-gram sets so dropped n-grams still lower the score
+        lengths = np.array([len(ngrams(norm, self.n)) for norm in normalized], dtype=float)
+        lengths[lengths == 0] = 1.0
+        return sparse.diags(1.0 / np.sqrt(lengths)) @ matrix
+
+    def match_many(self, names: List[str], threshold: float = 0.75, k: int = 1) -> List[List[Tuple[str, float]]]:
+        """For each name, up to k (name, cosine) pairs with cosine >= threshold, best first"""
+        results = []
+        for start in range(0, len(names), self.batch_size):
+            batch = [self.normalize(name) or "" for name in names[start:start + self.batch_size]]
+            scores = (self.vectorize(batch) @ self.targets).tocsr()
+            for row in range(scores.shape[0]):
+                begin, end = scores.indptr[row], scores.indptr[row + 1]
+                values, columns = scores.data[begin:end], scores.indices[begin:end]
+                keep = values >= threshold - 1e-9
+                values, columns = values[keep], columns[keep]
+                if len(values) > k:
+                    top = np.argpartition(-values, k - 1)[:k]
+                    values, columns = values[top], columns[top]
+                # Best first, earlier target names winning ties
+                order = np.lexsort((columns, -values))
+                results.append([(self.names[columns[i]], float(min(values[i], 1.0))) for i in order])
+        return results
+
+    def best_match(self, name: str, threshold: float = 0.75) -> Optional[Tuple[str, float]]:
+        matches = self.match_many([name], threshold, k=1)[0]
+        return matches[0] if matches else None
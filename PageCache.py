@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+class CachedPage:
+    def __init__(self, url: str, body: bytes, content_hash: str, fetched_at: float,
+                 etag: Optional[str], last_modified: Optional[str], fresh: bool):
+        self.url = url
+        self.body = body
+        self.content_hash = content_hash
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh = fresh
+
+
+class PageCache:
+    """Persistent, content-addressed cache of fetched HTML pages
+
+    Bodies are stored gzip-compressed under their sha256 so identical pages share
+    one object; a small SQLite index maps each canonical URL to its object along
+    with fetch time and the validators needed for conditional GETs.
+    """
+
+    def __init__(self, directory: str = ".page_cache", ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+        self.db.commit()
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Canonical cache key: the URL with its query parameters (pid, view, reporttype, ...) sorted"""
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+    def object_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, "objects", content_hash[:2], content_hash + ".gz")
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for url, or None; stale entries are returned with fresh=False"""
+        key = PageCache.key(url)
+        with self.lock:
+            row = self.db.execute(
+                "SELECT hash, fetched_at, etag, last_modified FROM pages WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            content_hash, fetched_at, etag, last_modified = row
+            try:
+                with gzip.open(self.object_path(content_hash), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self.db.execute("DELETE FROM pages WHERE url = ?", (key,))
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), key))
+            self.db.commit()
+        fresh = time.time() - fetched_at < self.ttl
+        return CachedPage(url, body, content_hash, fetched_at, etag, last_modified, fresh)
+
+    def store(self, url: str, body: bytes, etag: str = None, last_modified: str = None) -> str:
+        """Store a freshly fetched body and return its content hash"""
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self.object_path(content_hash)
+        with self.lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".tmp"
+                with gzip.open(tmp_path, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            now = time.time()
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages (url, hash, size, fetched_at, last_access, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (PageCache.key(url), content_hash, os.path.getsize(path), now, now, etag, last_modified))
+            self.db.commit()
+            self.evict()
+        return content_hash
+
+    def touch(self, url: str):
+        """Mark a cached page as revalidated (e.g. after a 304 Not Modified)"""
+        now = time.time()
+        with self.lock:
+            self.db.execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?",
+                            (now, now, PageCache.key(url)))
+            self.db.commit()
+
+    def entries(self) -> Iterator[Tuple[str, str]]:
+        """Yield (url, object path) for every cached page"""
+        with self.lock:
+            rows = self.db.execute("SELECT url, hash FROM pages ORDER BY url").fetchall()
+        for url, content_hash in rows:
+            yield url, self.object_path(content_hash)
+
+    def total_bytes(self) -> int:
+        row = self.db.execute("SELECT SUM(size) FROM (SELECT DISTINCT hash, size FROM pages)").fetchone()
+        return row[0] or 0
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self.db.execute("SELECT url, hash FROM pages ORDER BY last_access").fetchall()
+        for url, content_hash in rows:
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            still_used = self.db.execute("SELECT 1 FROM pages WHERE hash = ? LIMIT 1", (content_hash,)).fetchone()
+            if not still_used:
+                path = self.object_path(content_hash)
+                try:
+                    total -= os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    pass
+        self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from AdaptiveScheduler import AdaptiveScheduler, parse_retry_after
+from PageCache import CachedPage, PageCache
+
+
+def cached_response(url: str, cached: CachedPage) -> requests.Response:
+    """Wrap a cached body in a Response so callers need not care where it came from"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = cached.body
+    if cached.etag:
+        response.headers["ETag"] = cached.etag
+    if cached.last_modified:
+        response.headers["Last-Modified"] = cached.last_modified
+    response.from_cache = True
+    return response
+
+
+class PageFetcher:
+    """Pooled HTTP session with polite per-host concurrency and adaptive rate caps
+
+    max_workers threads fetch concurrently in fetch_many, with at most max_per_host
+    (default: max_workers) requests in flight to any one host.
+    """
+
+    def __init__(self, max_workers: int = 4, requests_per_second: float = 2.0, burst: int = 2,
+                 timeout: float = 30, headers: Optional[Dict[str, str]] = None, cache: PageCache = None,
+                 max_retries: int = 3, scheduler: AdaptiveScheduler = None, max_per_host: int = None,
+                 max_requests_per_second: float = None):
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+        self.cache = cache
+        self.scheduler = scheduler
+        self.max_workers = max_workers
+        self.max_per_host = min(max_per_host or max_workers, max_workers)
+        self.requests_per_second = requests_per_second
+        # The adaptive rate starts at requests_per_second and may climb to this ceiling
+        self.max_requests_per_second = max_requests_per_second or 2 * requests_per_second
+        self.burst = burst
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        # Keep-alive connections are reused across pids: one pool per host a worker may be
+        # talking to, each holding that host's connections; pool_block stops a burst of
+        # threads from opening more sockets than the pool allows
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=self.max_per_host, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.schedulers: Dict[str, AdaptiveScheduler] = {}
+        self.host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.lock = threading.Lock()
+
+    def host_state(self, url: str) -> Tuple[AdaptiveScheduler, threading.BoundedSemaphore]:
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.schedulers:
+                # A shared scheduler lets other fetch paths draw on the same request budget
+                self.schedulers[host] = self.scheduler or AdaptiveScheduler(
+                    self.requests_per_second, self.max_requests_per_second, burst=self.burst)
+                self.host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.schedulers[host], self.host_slots[host]
+
+    def fetch(self, url: str, accept: Callable[[requests.Response], bool] = None) -> requests.Response:
+        """Fetch a single page, serving fresh cache hits from disk and revalidating stale ones
+
+        Only 200 responses that pass accept (when given) are written to the cache. Raises
+        requests.HTTPError when every attempt was throttled (429/503).
+        """
+        cached = self.cache.lookup(url) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            return cached_response(url, cached)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        scheduler, slots = self.host_state(url)
+        for attempt in range(self.max_retries):
+            scheduler.wait()
+            try:
+                with slots:
+                    started = time.monotonic()
+                    response = self.session.get(url, timeout=self.timeout, headers=headers)
+            except requests.RequestException:
+                scheduler.record_error()
+                if attempt == self.max_retries - 1:
+                    raise
+                continue
+            if response.status_code in (429, 503):
+                scheduler.record_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                continue
+            scheduler.record_success(time.monotonic() - started)
+            break
+        else:
+            raise requests.HTTPError(f"{url} still throttled (HTTP {response.status_code}) "
+                                     f"after {self.max_retries} attempts", response=response)
+
+        if cached is not None and response.status_code == 304:
+            self.cache.touch(url)
+            return cached_response(url, cached)
+        if self.cache is not None and response.status_code == 200 and (accept is None or accept(response)):
+            self.cache.store(url, response.content, response.headers.get("ETag"),
+                             response.headers.get("Last-Modified"))
+        response.from_cache = False
+        return response
+
+    def fetch_safely(self, url: str) -> Tuple[str, Optional[requests.Response], Optional[Exception]]:
+        try:
+            return url, self.fetch(url), None
+        except requests.RequestException as e:
+            return url, None, e
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[requests.Response], Optional[Exception]]]:
+        """Fetch pages concurrently, yielding (url, response, error) in input order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(self.fetch_safely, urls):
+                yield result
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,33 +1,68 @@
-import json
-from typing import List
+import re
+import sys
+from typing import Dict, List, Optional
+
+from lxml import etree
 
 from DateEvent import DateEvent
 from Gender import Gender
 
+PID = re.compile(r'pid=(\d+)')
+ROWS = etree.XPath("tr")
+CELLS = etree.XPath("td")
+NAME = etree.XPath("td[position()=2]/b/text()")
+PERSON_LINK = etree.XPath("td[position()=2]//a/@href")
+
 
 class Person:
+    # Slotted and linked to parents by pid so very large trees stay small in memory
+    __slots__ = ('pid', 'name', 'gender', 'born', 'died', 'father_pid', 'mother_pid')
 
-    def __init__(self, node, name: str):
-        self.born: DateEvent = None
-        self.mother: Person
-        self.father: Person
+    def __init__(self, node, name: str, rows: List = None):
+        self.pid: Optional[int] = None
+        self.name = sys.intern(name) if name else name
         self.gender: Gender = None
-        self.name = name
-        self.died: DateEvent
-        self.parse(node)
+        self.born: DateEvent = None
+        self.died: DateEvent = None
+        self.father_pid: Optional[int] = None
+        self.mother_pid: Optional[int] = None
+        self.parse(node, rows)
 
-    def parse(self, node):
-        rows = node.xpath("tr")
+    def parse(self, node, rows: List = None):
+        # Callers that have already listed the rows pass them in to avoid a second query
+        if rows is None:
+            rows = ROWS(node)
         if self.name is None:
-            self.name = str(rows[0].xpath("td[position()=2]/b/text()")[0]).strip()
+            self.name = sys.intern(str(NAME(rows[0])[0]).strip())
+            for href in PERSON_LINK(rows[0]):
+                match = PID.search(href)
+                if match:
+                    self.pid = int(match.group(1))
+                    break
         for row in rows:
             self.person_info(row)
 
     def person_info(self, row):
-        cells = row.xpath("td")
+        cells = CELLS(row)
         cell_text = cells[0].text
-        if cell_text is not None and cell_text.strip() == "Born":
+        if cell_text is None:
+            return
+        label = cell_text.strip()
+        if label == "Born":
             self.born = DateEvent(cells)
+        elif label == "Died":
+            self.died = DateEvent(cells)
 
     def set_gender(self, value: Gender):
         self.gender = value
+
+    def to_dict(self) -> Dict:
+        return {
+            'pid': self.pid,
+            'name': self.name,
+            'gender': str(self.gender) if self.gender is not None else None,
+            'born': self.born.to_dict() if self.born is not None else None,
+            'died': self.died.to_dict() if self.died is not None else None,
+            'father_pid': self.father_pid,
+            'mother_pid': self.mother_pid
+        }
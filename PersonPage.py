@@ -0,0 +1,151 @@
+from lxml import etree, html
+import hashlib
+import re
+
+from Person import PID
+
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+DATE = (r'(?:(?:abt|about|bef|before|aft|after|circa|ca|c)\.?\s+)?'
+        rf'(?:\d{{1,2}}\s+{MONTH},?\s+\d{{4}}'        # 12 Mar 1950
+        rf'|{MONTH}\s+\d{{1,2}},?\s+\d{{4}}'           # March 12, 1950
+        rf'|{MONTH}\s+\d{{4}}'                         # Mar 1950
+        r'|\d{1,2}[-/.]\d{1,2}[-/.]\d{4}'              # 12/03/1950
+        r'|\d{4})')                                     # 1950
+# One pattern for every label so the page text is scanned once for both events
+LIFE_EVENT = re.compile(
+    rf'\b(?:(?P<birth>born|birth)|(?P<death>died|death))(?:\s+date)?[:\s]*(?:on\s+)?(?P<date>{DATE})\b',
+    re.IGNORECASE)
+LIFE_EVENT_LABELS = etree.XPath(
+    "//body//text()[re:test(., '(born|birth|died|death)', 'i')][not(ancestor::script or ancestor::style or ancestor::a)]",
+    namespaces={"re": "http://exslt.org/regular-expressions"})
+ENCLOSING_SECTION = etree.XPath(
+    "(ancestor-or-self::tr[1] | ancestor-or-self::*[self::p or self::div or self::li or self::dd][1])[last()]")
+# Relationship labels next to family links, mapped to the role of the linked person
+ROLE = re.compile(r'\b(father|mother|parents?|husband|wife|spouses?|children|child|sons?|daughters?'
+                  r'|siblings?|brothers?|sisters?)\b', re.IGNORECASE)
+ROLES = {'father': 'father', 'mother': 'mother', 'parent': 'parent', 'parents': 'parent',
+         'husband': 'spouse', 'wife': 'spouse', 'spouse': 'spouse', 'spouses': 'spouse',
+         'children': 'child', 'child': 'child', 'son': 'child', 'sons': 'child',
+         'daughter': 'child', 'daughters': 'child', 'sibling': 'sibling', 'siblings': 'sibling',
+         'brother': 'sibling', 'brothers': 'sibling', 'sister': 'sibling', 'sisters': 'sibling'}
+LINK_CELL = etree.XPath("ancestor::td[1]")
+PAGE_TEXT = etree.XPath("//text()[not(ancestor::script or ancestor::style)]")
+# Text of the site's CAPTCHA page and of the interstitials served in front of it
+SECURITY_CHECK_MARKERS = ("TribalPages Security", "Checking your browser before accessing")
+
+
+def is_security_check(page_source):
+    """Whether a page is a CAPTCHA or interstitial rather than the page asked for"""
+    return any(marker in page_source for marker in SECURITY_CHECK_MARKERS)
+
+
+def content_hash(page_source):
+    """sha256 of a page's visible text with whitespace collapsed
+
+    Raw HTML from the HTTP client and the browser's serialized DOM differ in markup
+    but not in text, so the same page hashes the same whichever path fetched it.
+    """
+    try:
+        text = ' '.join(' '.join(PAGE_TEXT(html.fromstring(page_source))).split())
+    except etree.ParserError:
+        text = ''
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def life_event_text(tree):
+    """Text of the rows holding birth/death labels, rather than the whole page"""
+    sections = []
+    for label in LIFE_EVENT_LABELS(tree):
+        element = label.getparent()
+        if element is not None and label.is_tail:
+            element = element.getparent()
+        if element is None:
+            continue
+        # The table row holding the label (label and date cells are siblings), else its block
+        enclosing = ENCLOSING_SECTION(element)
+        section = enclosing[0] if enclosing else element
+        if section not in sections:
+            sections.append(section)
+    return ' '.join(' '.join(section.itertext()) for section in sections)
+
+
+def link_role(link):
+    """Role of a family link taken from its label: the cells before it in its table row,
+    else the text before it in its parent element; None when there is no label"""
+    cell = LINK_CELL(link)
+    if cell:
+        before = [' '.join(previous.itertext()) for previous in cell[0].itersiblings(preceding=True)]
+        label = ' '.join(reversed(before))
+    else:
+        parent = link.getparent()
+        before = [' '.join(sibling.itertext()) + (sibling.tail or '')
+                  for sibling in link.itersiblings(preceding=True)]
+        label = (parent.text or '') + ' '.join(reversed(before))
+    matches = ROLE.findall(label)
+    return ROLES[matches[-1].lower()] if matches else None
+
+
+def parse_page_source(pid, page_source):
+    """Check that a page is a valid person page and parse it"""
+    if len(page_source) < 2000 or "Person not found" in page_source:
+        return "NOT_FOUND"
+    return parse_person_page(pid, page_source)
+
+
+def parse_person_page(pid, page_source):
+    """Parse person page for detailed information"""
+    tree = html.fromstring(page_source)
+
+    person_data = {
+        'pid': pid,
+        'name': None,
+        'birth_date': None,
+        'death_date': None,
+        'gender': None,
+        'father': None,
+        'mother': None,
+        'spouse': None,
+        'children': [],
+        'photos': [],
+        'additional_info': {}
+    }
+
+    # Extract name from page title
+    title = tree.findtext('.//title') or ''
+    if " - " in title and "Family Tree" in title:
+        name_part = title.split(" - ")[0].strip()
+        if name_part and len(name_part) > 2 and "Security" not in name_part:
+            person_data['name'] = name_part
+
+    # Extract family relationships
+    family_links = tree.xpath("//a[contains(@href, 'view=0&pid=')]")
+    for link in family_links:
+        href = link.get('href', '')
+        name = link.text or ''
+        if name and href and 'pid=' in href:
+            related_pid_match = PID.search(href)
+            if related_pid_match:
+                related_pid = int(related_pid_match.group(1))
+                if related_pid != pid:
+                    related = {'name': name.strip(), 'pid': related_pid}
+                    role = link_role(link)
+                    if role:
+                        related['role'] = role
+                    person_data['children'].append(related)
+
+    # Extract birth and death dates in one scan of the life-event rows
+    for match in LIFE_EVENT.finditer(life_event_text(tree)):
+        event = 'birth_date' if match.group('birth') else 'death_date'
+        if person_data[event] is None:
+            person_data[event] = match.group('date')
+            if person_data['birth_date'] and person_data['death_date']:
+                break
+
+    # Extract photos
+    img_elements = tree.xpath("//img[contains(@src, 'photo') or contains(@src, 'saikura')]")
+    for img in img_elements:
+        src = img.get('src', '')
+        if src and 'saikura' in src:
+            person_data['photos'].append(src)
+
+    return person_data
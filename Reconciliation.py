@@ -0,0 +1,248 @@
+import hashlib
+import os
+import pickle
+from typing import Dict, List, Optional, Set, Tuple
+
+from FamilyStore import open_store
+from GedcomReader import parse_gedcom
+from MatchCache import MatchCache
+from NameMatcher import NameMatcher
+from NameNormalizer import normalize_many, normalize_name
+from NgramSimilarity import NgramSimilarity
+from RecordLinkage import RecordLinker
+
+CACHE_VERSION = 3
+
+
+def extract_tribal_names(store):
+    """Extract all unique names from the Tribal database with parent and children info"""
+    names = set()
+    pid_to_names = {}
+    name_to_info = {}  # Store parent and children information for each name
+
+    # Names come from children connections
+    for child_pid, name in store.linked_names():
+        names.add(name)
+        if child_pid:
+            if child_pid not in pid_to_names:
+                pid_to_names[child_pid] = set()
+            pid_to_names[child_pid].add(name)
+
+    # Build parent relationships and children from the data structure
+    # In Tribal data, if someone appears in a person's children list, that person is the parent
+    for pid, person_children in store.child_names_by_parent():
+        parent_names = pid_to_names.get(pid, set())
+        parent_name = list(parent_names)[0] if parent_names else None
+
+        for child_name in person_children:
+            # Add parent relationship
+            if child_name not in name_to_info:
+                name_to_info[child_name] = {'parents': [], 'children': []}
+            if parent_name and parent_name not in name_to_info[child_name]['parents']:
+                name_to_info[child_name]['parents'].append(parent_name)
+
+        # Store children for this parent
+        if parent_name:
+            if parent_name not in name_to_info:
+                name_to_info[parent_name] = {'parents': [], 'children': []}
+            name_to_info[parent_name]['children'].extend(person_children)
+
+    return names, pid_to_names, name_to_info
+
+
+def best_matches(names: List[str], targets: List[str], threshold: float,
+                 backend: str = 'sequence', scores=None) -> List[Optional[Tuple[str, float]]]:
+    """Best (target, similarity) at or above threshold for each name, or None
+
+    backend 'sequence' scores SequenceMatcher ratios over blocked candidates, reusing
+    pair scores from scores when given; 'ngram' scores character trigram cosine
+    similarity in batched sparse matrix products.
+    """
+    if backend == 'ngram':
+        return [matches[0] if matches else None
+                for matches in NgramSimilarity(targets, normalize=normalize_name).match_many(names, threshold)]
+    matcher = NameMatcher(targets, normalize=normalize_name, scores=scores)
+    return [matcher.best_match(name, threshold) for name in names]
+
+
+class Reconciliation:
+    """Tribal extraction and MyHeritage GEDCOM matched against each other
+
+    Holds everything the JSON and HTML reports render, so both can be produced from one
+    computed (and cached) result.
+    """
+
+    def __init__(self, myheritage_people: Dict[str, Dict], tribal_total: int, tribal_names: Set[str],
+                 pid_to_names: Dict[int, Set[str]], tribal_name_to_info: Dict[str, Dict]):
+        self.myheritage_people = myheritage_people
+        self.tribal_total = tribal_total
+        self.tribal_names = tribal_names
+        self.pid_to_names = pid_to_names
+        self.tribal_name_to_info = tribal_name_to_info
+        self.exact_matches: List[Dict] = []
+        self.fuzzy_matches: List[Dict] = []
+        self.only_in_myheritage: List[Dict] = []    # without an exact match
+        self.only_in_tribal: List[str] = []
+
+    def family_confirmed(self, person: Dict, tribal_name: str) -> bool:
+        """Whether one of the MyHeritage person's parents is also a Tribal parent of the name"""
+        mh_parents = {normalize_name(parent) for parent in (person.get('father'), person.get('mother')) if parent}
+        if not mh_parents:
+            return False
+        info = self.tribal_name_to_info.get(tribal_name)
+        return bool(info) and any(normalize_name(parent) in mh_parents for parent in info['parents'])
+
+    def match(self, threshold: float = 0.70, family_threshold: float = 0.60, backend: str = 'sequence',
+              linkage: bool = False, scores=None):
+        """Exact matches on normalized names, then fuzzy matches for the rest
+
+        A fuzzy candidate below threshold is still accepted, down to family_threshold,
+        when the two records share a parent. With linkage, every person is instead linked
+        by RecordLinker on name plus family context, and exact-name pairs it rejects are
+        left unmatched.
+        """
+        people = self.myheritage_people
+        normalized = normalize_many([p['name'] for p in people.values()] + list(self.tribal_names))
+        if linkage:
+            return self.link(normalized, threshold, family_threshold, scores)
+        myheritage_normalized = {normalized[p['name']]: p for p in people.values() if p['name']}
+        tribal_normalized = {normalized[name]: name for name in self.tribal_names}
+
+        for norm_name, person in myheritage_normalized.items():
+            if norm_name in tribal_normalized:
+                tribal_name = tribal_normalized[norm_name]
+                self.exact_matches.append({
+                    'myheritage_name': person['name'],
+                    'tribal_name': tribal_name,
+                    'birth': person.get('birth'),
+                    'death': person.get('death'),
+                    'family_confirmed': self.family_confirmed(person, tribal_name)
+                })
+            else:
+                self.only_in_myheritage.append(person)
+
+        for norm_name, original_name in tribal_normalized.items():
+            if norm_name not in myheritage_normalized:
+                self.only_in_tribal.append(original_name)
+
+        unmatched_myheritage = [p for p in people.values() if normalized[p['name']] not in tribal_normalized]
+        unmatched_tribal = [name for name in self.tribal_names if normalized[name] not in myheritage_normalized]
+        best = best_matches([p['name'] for p in unmatched_myheritage], unmatched_tribal,
+                            min(threshold, family_threshold), backend, scores)
+        for person, match in zip(unmatched_myheritage, best):
+            if not match:
+                continue
+            tribal_name, similarity = match
+            confirmed = self.family_confirmed(person, tribal_name)
+            if similarity >= threshold or confirmed:
+                self.fuzzy_matches.append({
+                    'myheritage_name': person['name'],
+                    'tribal_name': tribal_name,
+                    'similarity': round(similarity * 100, 1),
+                    'family_confirmed': confirmed
+                })
+        return self
+
+    def link(self, normalized: Dict[Optional[str], str], threshold: float, family_threshold: float, scores=None):
+        """Split RecordLinker links into exact and fuzzy matches by their normalized names"""
+        linker = RecordLinker(self.myheritage_people, self.tribal_name_to_info,
+                              candidate_threshold=min(threshold, family_threshold), accept=threshold,
+                              scores=scores)
+        links = linker.link(self.tribal_names)
+        exact_tribal = set()
+        for person_id, person in self.myheritage_people.items():
+            link = links.get(person_id)
+            if link is not None and normalized[person['name']] == normalized[link.tribal_name]:
+                exact_tribal.add(link.tribal_name)
+                self.exact_matches.append({
+                    'myheritage_name': person['name'],
+                    'tribal_name': link.tribal_name,
+                    'birth': person.get('birth'),
+                    'death': person.get('death'),
+                    'family_confirmed': link.agreeing > 0
+                })
+                continue
+            if person['name']:
+                self.only_in_myheritage.append(person)
+            if link is not None:
+                self.fuzzy_matches.append({
+                    'myheritage_name': person['name'],
+                    'tribal_name': link.tribal_name,
+                    'similarity': round(link.similarity * 100, 1),
+                    'family_confirmed': link.agreeing > 0
+                })
+        self.only_in_tribal = [name for name in self.tribal_names if name not in exact_tribal]
+        return self
+
+    def unmatched(self) -> Tuple[List[Dict], List[str]]:
+        """MyHeritage people and Tribal names with neither an exact nor a fuzzy match"""
+        fuzzy_matched_mh = {match['myheritage_name'] for match in self.fuzzy_matches}
+        fuzzy_matched_tribal = {match['tribal_name'] for match in self.fuzzy_matches}
+        return ([p for p in self.only_in_myheritage if p['name'] not in fuzzy_matched_mh],
+                [name for name in self.only_in_tribal if name not in fuzzy_matched_tribal])
+
+
+def file_digest(filename: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(*filenames: str) -> Tuple:
+    """(name, sha256) of each existing input file, to tell when a cached result is stale"""
+    return tuple((filename, file_digest(filename)) for filename in filenames if os.path.exists(filename))
+
+
+def reconcile(gedcom_filename: str = 'MyHeritage.ged', store_basename: str = 'SAIKURA_RESILIENT_FAMILY_DATABASE',
+              threshold: float = 0.70, family_threshold: float = 0.60, backend: str = 'sequence',
+              linkage: bool = False, cache_filename: Optional[str] = '.reconciliation_cache.pickle',
+              match_cache_filename: Optional[str] = '.match_cache.sqlite', follow: bool = False) -> Reconciliation:
+    """Load both sources once and match them, reusing the cached result while inputs are unchanged
+
+    When an input has changed, pair scores from match_cache_filename are reused so only
+    pairs involving new or changed names are scored again. With follow and a crawl in
+    progress, Tribal records are read as the crawl writes them and matching starts once
+    it finishes; the result is not cached, since the inputs were still changing.
+    """
+    if follow and os.path.exists(store_basename + '.ndjson.partial'):
+        print(f"Following the crawl in progress: {store_basename}.ndjson.partial")
+        cache_filename = None
+    key = (CACHE_VERSION, threshold, family_threshold, backend, linkage,
+           source_fingerprint(gedcom_filename, *(store_basename + suffix for suffix in ('.sqlite', '.ndjson', '.json'))))
+    if cache_filename and os.path.exists(cache_filename):
+        try:
+            with open(cache_filename, 'rb') as f:
+                cached_key, result = pickle.load(f)
+            if cached_key == key:
+                print(f"Using cached reconciliation: {cache_filename}")
+                return result
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            pass
+
+    print("Loading databases...")
+    # Parse MyHeritage GEDCOM first, so following a crawl overlaps with it
+    myheritage_people = parse_gedcom(gedcom_filename)
+
+    # Query the indexed Tribal database
+    store = open_store(store_basename, follow=follow)
+    tribal_total = store.count_people()
+    tribal_names, pid_to_names, name_to_info = extract_tribal_names(store)
+    store.close()
+
+    print("Matching names...")
+    result = Reconciliation(myheritage_people, tribal_total, tribal_names, pid_to_names, name_to_info)
+    scores = MatchCache(NameMatcher.VERSION, match_cache_filename) if match_cache_filename else None
+    try:
+        result.match(threshold, family_threshold, backend, linkage, scores)
+    finally:
+        if scores is not None:
+            scores.close()
+
+    if cache_filename:
+        tmp = cache_filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump((key, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_filename)
+    return result
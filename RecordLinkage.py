@@ -0,0 +1,127 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from NameMatcher import NameMatcher
+from NameNormalizer import normalize_name
+
+
+class Link:
+    __slots__ = ('person_id', 'tribal_name', 'similarity', 'agreeing', 'score')
+
+    def __init__(self, person_id: str, tribal_name: str, similarity: float, agreeing: int, score: float):
+        self.person_id = person_id
+        self.tribal_name = tribal_name
+        self.similarity = similarity    # name similarity alone
+        self.agreeing = agreeing        # relatives that agree between the two records
+        self.score = score
+
+
+class RecordLinker:
+    """Links MyHeritage people to Tribal names on name similarity plus family context
+
+    Candidates come from the n-gram blocked NameMatcher, k per person, so the work stays
+    proportional to the number of people. A candidate pair gains score for each relative
+    (parent or child) the two records agree on: either the relatives' names match, or
+    the MyHeritage relative is currently linked to one of the Tribal record's relatives.
+    A pair whose records both list relatives with none in common is penalized. Links are
+    rescored in rounds, each round only revisiting people whose relatives' links changed,
+    so confirmed matches propagate outward through the family.
+    """
+
+    def __init__(self, people: Dict[str, Dict], tribal_info: Dict[str, Dict],
+                 candidates: int = 5, candidate_threshold: float = 0.60,
+                 context_weight: float = 0.15, conflict_penalty: float = 0.20,
+                 accept: float = 0.75, max_rounds: int = 5, scores=None):
+        self.people = people
+        self.tribal_info = tribal_info
+        self.candidates = candidates
+        self.candidate_threshold = candidate_threshold
+        self.context_weight = context_weight
+        self.conflict_penalty = conflict_penalty
+        self.accept = accept
+        self.max_rounds = max_rounds
+        self.scores = scores
+
+        ids_by_name: Dict[str, List[str]] = defaultdict(list)
+        for person_id, person in people.items():
+            if person.get('name'):
+                ids_by_name[normalize_name(person['name'])].append(person_id)
+        # MyHeritage relatives by normalized name, and the people whose score depends on each person
+        self.relatives: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = defaultdict(set)
+        for person_id, person in people.items():
+            relatives = {normalize_name(name) for name in self.relative_names(person)} - {""}
+            self.relatives[person_id] = relatives
+            for name in relatives:
+                for relative_id in ids_by_name.get(name, ()):
+                    self.dependents[relative_id].add(person_id)
+        self.ids_by_name = ids_by_name
+        self.tribal_relatives: Dict[str, Set[str]] = {
+            name: {normalize_name(relative) for relative in info['parents'] + info['children']} - {""}
+            for name, info in tribal_info.items()
+        }
+
+    @staticmethod
+    def relative_names(person: Dict) -> Iterable[str]:
+        for key in ('father', 'mother'):
+            if person.get(key):
+                yield person[key]
+        yield from person.get('children') or ()
+
+    def agreement(self, person_id: str, tribal_name: str, links: Dict[str, Link]) -> Tuple[int, bool]:
+        """(relatives agreeing, whether both sides list relatives) for one candidate pair"""
+        relatives = self.relatives[person_id]
+        tribal_relatives = self.tribal_relatives.get(tribal_name)
+        if not relatives or not tribal_relatives:
+            return 0, False
+        agreeing = 0
+        for name in relatives:
+            if name in tribal_relatives:
+                agreeing += 1
+                continue
+            for relative_id in self.ids_by_name.get(name, ()):
+                link = links.get(relative_id)
+                if link is not None and normalize_name(link.tribal_name) in tribal_relatives:
+                    agreeing += 1
+                    break
+        return agreeing, True
+
+    def score(self, person_id: str, tribal_name: str, similarity: float, links: Dict[str, Link]) -> Link:
+        agreeing, both_known = self.agreement(person_id, tribal_name, links)
+        score = similarity + self.context_weight * min(agreeing, 3)
+        if both_known and not agreeing:
+            score -= self.conflict_penalty
+        return Link(person_id, tribal_name, similarity, agreeing, score)
+
+    def link(self, tribal_names: Iterable[str], person_ids: Optional[Iterable[str]] = None) -> Dict[str, Link]:
+        """Best accepted link for each linkable person, by person id"""
+        person_ids = [person_id for person_id in (person_ids if person_ids is not None else self.people)
+                      if self.people[person_id].get('name')]
+        matcher = NameMatcher(tribal_names, normalize=normalize_name, scores=self.scores)
+        candidates = {person_id: matcher.match(self.people[person_id]['name'], self.candidate_threshold,
+                                               self.candidates)
+                      for person_id in person_ids}
+
+        links: Dict[str, Link] = {}
+        pending: Set[str] = set(person_ids)
+        for _ in range(self.max_rounds):
+            changed: Set[str] = set()
+            for person_id in sorted(pending):
+                best = None
+                for tribal_name, similarity in candidates.get(person_id, ()):
+                    scored = self.score(person_id, tribal_name, similarity, links)
+                    if best is None or scored.score > best.score:
+                        best = scored
+                current = links.get(person_id)
+                if best is not None and best.score >= self.accept:
+                    if current is None or current.tribal_name != best.tribal_name:
+                        changed.add(person_id)
+                    links[person_id] = best
+                elif current is not None:
+                    del links[person_id]
+                    changed.add(person_id)
+            if not changed:
+                break
+            pending = {dependent for person_id in changed for dependent in self.dependents.get(person_id, ())
+                       if dependent in candidates}
+        return links
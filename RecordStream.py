@@ -0,0 +1,171 @@
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# A crawl can go quiet for the scheduler's longest backoff (300s); twice that without a
+# new record means the writer died without finishing
+FOLLOW_IDLE_TIMEOUT = 600.0
+
+
+class RecordWriter:
+    """Writes one newline-delimited JSON record per pid as extraction proceeds"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, pid: int, person: Dict, content_hash: str = None):
+        record = {"pid": pid, "content_hash": content_hash, "person": person}
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Flushed per record so other tools can follow the file while the crawl runs
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_records(filename: str) -> Iterator[Dict]:
+    """Yield {"pid", "content_hash", "person"} records, stopping at a torn final line"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                return
+
+
+def follow_records(filename: str, poll_interval: float = 1.0,
+                   idle_timeout: Optional[float] = FOLLOW_IDLE_TIMEOUT) -> Iterator[Dict]:
+    """Yield records from a file that is still being written, waiting for new lines
+
+    A line is only decoded once its newline has arrived. Following stops when the
+    writer has renamed the file away (the crawl finished and the .ndjson.partial
+    became the .ndjson) and the remaining lines are read, or after idle_timeout
+    seconds without new data (None waits indefinitely).
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        pending = ''
+        idle_since = time.monotonic()
+        finished = False
+        while True:
+            line = f.readline()
+            if line:
+                pending += line
+                if pending.endswith('\n'):
+                    yield json.loads(pending)
+                    pending = ''
+                idle_since = time.monotonic()
+                continue
+            if finished:
+                return
+            # Read once more after the rename so lines written just before it are not lost
+            if not os.path.exists(filename):
+                finished = True
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                print(f"No new records in {filename} for {idle_timeout:.0f}s, stopping")
+                return
+            time.sleep(poll_interval)
+
+
+class PeopleFile:
+    """Re-iterable view of the person records in a family database
+
+    Streams newline-delimited databases record by record; with follow, a database
+    that is still being written is tailed until the crawl finishes. A legacy pretty
+    JSON database is loaded whole, once.
+    """
+
+    def __init__(self, filename: str, follow: bool = False, idle_timeout: Optional[float] = FOLLOW_IDLE_TIMEOUT):
+        self.filename = filename
+        self.follow = follow
+        self.idle_timeout = idle_timeout
+        self.people: Optional[List[Dict]] = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        if self.follow:
+            for record in follow_records(self.filename, idle_timeout=self.idle_timeout):
+                yield record["person"]
+        elif self.filename.endswith('.ndjson'):
+            for record in iter_records(self.filename):
+                yield record["person"]
+        else:
+            if self.people is None:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    self.people = list(json.load(f)['people'].values())
+            yield from self.people
+
+    def count(self) -> int:
+        if self.people is not None:
+            return len(self.people)
+        return sum(1 for _ in self)
+
+
+def open_people(basename: str = "SAIKURA_RESILIENT_FAMILY_DATABASE", follow: bool = False,
+                idle_timeout: Optional[float] = FOLLOW_IDLE_TIMEOUT) -> PeopleFile:
+    """The newline-delimited database when present, else the pretty JSON export
+
+    With follow, a crawl still in progress is read from its .ndjson.partial file as
+    records are appended, giving up after idle_timeout seconds without one.
+    """
+    if follow and os.path.exists(basename + ".ndjson.partial"):
+        return PeopleFile(basename + ".ndjson.partial", follow=True, idle_timeout=idle_timeout)
+    if os.path.exists(basename + ".ndjson"):
+        return PeopleFile(basename + ".ndjson")
+    return PeopleFile(basename + ".json")
+
+
+def index_records(filename: str) -> List[Tuple[int, int]]:
+    """(pid, byte offset) of every complete record, sorted by pid"""
+    index = []
+    with open(filename, 'rb') as f:
+        offset = 0
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            index.append((int(record["pid"]), offset))
+            offset += len(line)
+    index.sort()
+    return index
+
+
+def export_pretty_json(ndjson_filename: str, json_filename: str, metadata: Dict):
+    """Write the indented {"people": {...}, "content_hashes": {...}} export without loading every record
+
+    Records are written in pid order, read back one at a time through an index of
+    their offsets, since the newline-delimited file is in crawl order.
+    """
+    index = index_records(ndjson_filename)
+    with open(json_filename, 'w', encoding='utf-8') as f, open(ndjson_filename, 'rb') as records:
+        f.write("{\n")
+        for key, value in metadata.items():
+            f.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+        f.write(f'  "total_people_extracted": {len(index)},\n')
+
+        for section in ("people", "content_hashes"):
+            f.write(f'  "{section}": {{')
+            first = True
+            for _, offset in index:
+                records.seek(offset)
+                record = json.loads(records.readline())
+                value = record["person"] if section == "people" else record["content_hash"]
+                if section == "content_hashes" and value is None:
+                    continue
+                body = json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+                f.write(("\n" if first else ",\n") + f'    "{record["pid"]}": {body}')
+                first = False
+            f.write("\n  }" if not first else "}")
+            f.write(",\n" if section == "people" else "\n")
+        f.write("}")
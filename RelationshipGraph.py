@@ -0,0 +1,237 @@
+import json
+from array import array
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from FamilyStore import name_key
+
+CHILD = "child"
+SPOUSE = "spouse"
+
+
+def legacy_roles(links: List[Dict]) -> List[Optional[str]]:
+    """Roles for a page's links when none were recorded (pages crawled before roles were)
+
+    Such a page lists its two parents first as father, mother, mother, father: once from
+    the parents cell and once from the pedigree chart. Those four links are parents;
+    the rest cannot be told apart and get no role.
+    """
+    roles: List[Optional[str]] = [None] * len(links)
+    pids = [link.get('pid') for link in links]
+    if len(pids) >= 4 and pids[0] == pids[3] and pids[1] == pids[2] and pids[0] != pids[1]:
+        roles[:4] = ['parent'] * 4
+    return roles
+
+
+def compact(pairs: Iterable[Tuple[int, int]], size: int) -> Tuple[array, array]:
+    """Pack (source, target) node indexes into offset/target arrays, one slice per source"""
+    pairs = sorted(set(pairs))
+    offsets = array('l', [0] * (size + 1))
+    for source, _ in pairs:
+        offsets[source + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+    return offsets, array('l', (target for _, target in pairs))
+
+
+class RelationshipGraph:
+    """Deduplicated family graph with typed edges and forward/reverse adjacency arrays
+
+    Child edges run parent -> child, so the reverse adjacency of a child edge gives a
+    person's parents. Spouse edges are stored in both directions. Every pid keeps the
+    list of names it was observed under. Child edges that would make someone their own
+    ancestor (mutual pairs and longer cycles) are dropped at build time and kept in
+    rejected for inspection.
+    """
+
+    def __init__(self):
+        self.pids: List[int] = []
+        self.index: Dict[int, int] = {}
+        self.aliases: Dict[int, List[str]] = {}
+        self.edges: Dict[str, Set[Tuple[int, int]]] = {CHILD: set(), SPOUSE: set()}
+        self.forward: Dict[str, Tuple[array, array]] = {}
+        self.reverse: Dict[str, Tuple[array, array]] = {}
+        self.rejected: List[Tuple[int, int]] = []   # (parent pid, child pid) child edges dropped by build()
+
+    @classmethod
+    def from_people(cls, people: Iterable[Dict], min_shared_pages: int = 5) -> 'RelationshipGraph':
+        """Build the graph from extracted person records
+
+        A page's links are typed by the role label they appear under. A page whose links
+        carry no roles at all falls back to legacy_roles, and its two parents are also
+        linked as spouses. Links left without a role (and a link list that appears
+        identically on min_shared_pages or more pages, which is site navigation)
+        contribute aliases but no edges.
+        """
+        people = list(people)
+        shared = Counter(frozenset(link.get('pid') for link in person.get('children', [])) for person in people)
+        graph = cls()
+        for person in people:
+            pid = int(person['pid'])
+            graph.add_alias(pid, person.get('name'))
+            links = person.get('children', [])
+            boilerplate = len(links) > 1 and shared[frozenset(link.get('pid') for link in links)] >= min_shared_pages
+            legacy = not any(link.get('role') for link in links)
+            roles = legacy_roles(links) if legacy else [link.get('role') for link in links]
+            for link, role in zip(links, roles):
+                if link.get('pid'):
+                    graph.add_alias(link['pid'], link.get('name'))
+                    if not boilerplate and link['pid'] != pid:
+                        graph.add_link(pid, link['pid'], role)
+            if legacy and not boilerplate and roles[:2] == ['parent', 'parent']:
+                graph.add_edge(SPOUSE, links[0]['pid'], links[1]['pid'])
+
+        # Parent and spouse fields hold names; link them where the name identifies one pid
+        by_name = graph.pids_by_name()
+        for person in people:
+            pid = int(person['pid'])
+            for field, kind in (('father', CHILD), ('mother', CHILD), ('spouse', SPOUSE)):
+                related = by_name.get(name_key(person.get(field)), [])
+                if len(related) == 1 and related[0] != pid:
+                    if kind == SPOUSE:
+                        graph.add_edge(SPOUSE, pid, related[0])
+                    else:
+                        graph.add_edge(CHILD, related[0], pid)
+        graph.build()
+        return graph
+
+    def node(self, pid: int) -> int:
+        if pid not in self.index:
+            self.index[pid] = len(self.pids)
+            self.pids.append(pid)
+            self.aliases[pid] = []
+        return self.index[pid]
+
+    def add_alias(self, pid: int, name: Optional[str]):
+        self.node(pid)
+        name = (name or '').strip()
+        if name and name != 'more..' and name not in self.aliases[pid]:
+            self.aliases[pid].append(name)
+
+    def add_link(self, pid: int, related_pid: int, role: Optional[str]):
+        """Edge for a link on pid's page to a person in the given role"""
+        if role == 'child':
+            self.add_edge(CHILD, pid, related_pid)
+        elif role in ('father', 'mother', 'parent'):
+            self.add_edge(CHILD, related_pid, pid)
+        elif role == 'spouse':
+            self.add_edge(SPOUSE, pid, related_pid)
+
+    def add_edge(self, kind: str, source: int, target: int):
+        self.edges[kind].add((self.node(source), self.node(target)))
+        if kind == SPOUSE:
+            self.edges[kind].add((self.node(target), self.node(source)))
+
+    def drop_child_cycles(self):
+        """Remove mutual child edges, then the back edges of a depth-first walk, which
+        leaves the child edges acyclic"""
+        child = self.edges[CHILD]
+        mutual = {(source, target) for source, target in child if (target, source) in child}
+        child -= mutual
+        rejected = set(mutual)
+        offsets, targets = compact(child, len(self.pids))
+        state = [0] * len(self.pids)   # 0 unvisited, 1 on the current path, 2 done
+        for root in range(len(self.pids)):
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [(root, offsets[root])]
+            while stack:
+                node, position = stack[-1]
+                if position == offsets[node + 1]:
+                    state[node] = 2
+                    stack.pop()
+                    continue
+                stack[-1] = (node, position + 1)
+                target = targets[position]
+                if state[target] == 1:
+                    rejected.add((node, target))
+                elif state[target] == 0:
+                    state[target] = 1
+                    stack.append((target, offsets[target]))
+        child -= rejected
+        self.rejected = sorted((self.pids[source], self.pids[target]) for source, target in rejected)
+
+    def build(self):
+        """Pack the edge sets into adjacency arrays for traversal"""
+        self.drop_child_cycles()
+        size = len(self.pids)
+        for kind, pairs in self.edges.items():
+            self.forward[kind] = compact(pairs, size)
+            self.reverse[kind] = compact(((target, source) for source, target in pairs), size)
+
+    def pids_by_name(self) -> Dict[str, List[int]]:
+        by_name: Dict[str, List[int]] = {}
+        for pid, names in self.aliases.items():
+            for key in {name_key(name) for name in names}:
+                by_name.setdefault(key, []).append(pid)
+        return by_name
+
+    def neighbours(self, adjacency: Tuple[array, array], pid: int) -> List[int]:
+        if pid not in self.index:
+            return []
+        offsets, targets = adjacency
+        i = self.index[pid]
+        return [self.pids[target] for target in targets[offsets[i]:offsets[i + 1]]]
+
+    def children(self, pid: int) -> List[int]:
+        return self.neighbours(self.forward[CHILD], pid)
+
+    def parents(self, pid: int) -> List[int]:
+        return self.neighbours(self.reverse[CHILD], pid)
+
+    def spouses(self, pid: int) -> List[int]:
+        return self.neighbours(self.forward[SPOUSE], pid)
+
+    def traverse(self, adjacency: Tuple[array, array], pid: int) -> List[int]:
+        """Breadth-first walk visiting each edge once; the start pid is not included"""
+        if pid not in self.index:
+            return []
+        offsets, targets = adjacency
+        start = self.index[pid]
+        seen = {start}
+        order = []
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            for target in targets[offsets[i]:offsets[i + 1]]:
+                if target not in seen:
+                    seen.add(target)
+                    order.append(self.pids[target])
+                    queue.append(target)
+        return order
+
+    def ancestors(self, pid: int) -> List[int]:
+        return self.traverse(self.reverse[CHILD], pid)
+
+    def descendants(self, pid: int) -> List[int]:
+        return self.traverse(self.forward[CHILD], pid)
+
+    def edge_count(self) -> int:
+        return len(self.edges[CHILD]) + len(self.edges[SPOUSE]) // 2
+
+    def save(self, filename: str):
+        """Write the graph as node, alias and edge lists"""
+        data = {
+            "pids": self.pids,
+            "aliases": {str(pid): names for pid, names in self.aliases.items() if names},
+            "edges": {kind: sorted([self.pids[s], self.pids[t]] for s, t in pairs if kind != SPOUSE or s < t)
+                      for kind, pairs in self.edges.items()}
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, filename: str) -> 'RelationshipGraph':
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        graph = cls()
+        for pid in data["pids"]:
+            graph.node(pid)
+        for pid, names in data["aliases"].items():
+            graph.aliases[int(pid)] = names
+        for kind, pairs in data["edges"].items():
+            for source, target in pairs:
+                graph.add_edge(kind, source, target)
+        graph.build()
+        return graph
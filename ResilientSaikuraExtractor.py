@@ -4,26 +4,61 @@ Resilient Saikura Family Extractor
 Uses multiple strategies to extract family data despite CAPTCHA blocks
 """
 
-from lxml import html
+import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+import argparse
 import time
 import json
-import re
-import random
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from AdaptiveScheduler import AdaptiveScheduler
+from BrowserPool import BrowserPool
+from CheckpointJournal import CheckpointJournal
+from FamilyStore import FamilyStore
+from PageCache import PageCache
+from PageFetcher import PageFetcher
+from PersonPage import content_hash, is_security_check, parse_page_source, parse_person_page
+from RecordStream import RecordWriter, export_pretty_json, iter_records
+from RelationshipGraph import RelationshipGraph
 
 
 class ResilientSaikuraExtractor:
-    def __init__(self):
-        self.driver = None
+    person_url_template = "https://saikura.tribalpages.com/tribe/browse?userid=saikura&view=0&pid={pid}"
+    database = "SAIKURA_RESILIENT_FAMILY_DATABASE"
+
+    def __init__(self, cache: PageCache = None, journal: CheckpointJournal = None,
+                 scheduler: AdaptiveScheduler = None, fetcher: PageFetcher = None,
+                 browser_workers: int = 1, recycle_after: int = 50, store: FamilyStore = None):
         self.all_people = {}
         self.session_established = False
-        
-    def setup_driver(self):
+        self.session_attempted = False
+        self.session_lock = threading.Lock()
+        self.cache = cache if cache is not None else PageCache()
+        self.content_hashes = {}
+        self.stream = None
+        self.streamed = set()
+        self.journal = journal if journal is not None else CheckpointJournal()
+        self.store = store if store is not None else FamilyStore(self.database + ".sqlite")
+        self.scheduler = scheduler if scheduler is not None else AdaptiveScheduler(rate=0.5, max_rate=1.0)
+        # The HTTP client and the browser draw on the same request budget
+        self.fetcher = fetcher if fetcher is not None else PageFetcher(max_workers=browser_workers,
+                                                                        cache=self.cache,
+                                                                        scheduler=self.scheduler)
+        self.browser_workers = browser_workers
+        self.browser_pool = BrowserPool(self.open_browser, size=browser_workers, recycle_after=recycle_after,
+                                        scheduler=self.scheduler)
+        
+    def setup_driver(self, profile_dir=None):
         """Setup Chrome WebDriver with stealth options"""
         chrome_options = Options()
+        if profile_dir:
+            chrome_options.add_argument(f"--user-data-dir={profile_dir}")
         # Add stealth options to avoid detection
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
@@ -35,24 +70,26 @@ class ResilientSaikuraExtractor:
         
         try:
             service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
             # Remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             print("Chrome browser opened with stealth settings")
+            return driver
         except Exception as e:
             print(f"Error setting up Chrome driver: {e}")
             raise
     
-    def try_establish_session(self):
+    def try_establish_session(self, driver):
         """Try to establish a working session by accessing the site"""
         print("Attempting to establish session with the site...")
 
-        # Try the homepage first
-        self.driver.get("https://saikura.tribalpages.com/tribe/browse?userid=saikura&view=9")
+        # Try the homepage first, paced like any other page load
+        self.scheduler.wait()
+        driver.get("https://saikura.tribalpages.com/tribe/browse?userid=saikura&view=9")
         time.sleep(5)
 
         # Check if we need CAPTCHA
-        title = self.driver.title
+        title = driver.title
         if "TribalPages Security" in title:
             print("CAPTCHA detected. Waiting 20 seconds for manual resolution...")
             print("Please solve the CAPTCHA in the browser window NOW!")
@@ -61,7 +98,7 @@ class ResilientSaikuraExtractor:
             for i in range(20):
                 time.sleep(1)
                 try:
-                    current_title = self.driver.title
+                    current_title = driver.title
                     if "TribalPages Security" not in current_title:
                         print("CAPTCHA resolved! Session established.")
                         self.session_established = True
@@ -74,7 +111,7 @@ class ResilientSaikuraExtractor:
 
             # Check one final time
             try:
-                if "TribalPages Security" not in self.driver.title:
+                if "TribalPages Security" not in driver.title:
                     print("CAPTCHA resolved! Session established.")
                     self.session_established = True
                     return True
@@ -88,207 +125,348 @@ class ResilientSaikuraExtractor:
             self.session_established = True
             return True
     
-    def resilient_extract_person(self, pid):
-        """Extract person data with multiple retry strategies"""
+    def open_browser(self, profile_dir):
+        """Open a browser for a pool worker, establishing a session with the site once per pool
+
+        Browsers opened later (other workers, recycles, restarts) go straight to person
+        pages; a CAPTCHA there is handled by the page-load backoff instead.
+        """
+        driver = self.setup_driver(profile_dir)
+        with self.session_lock:
+            if not self.session_attempted:
+                self.session_attempted = True
+                if not self.try_establish_session(driver):
+                    print("Could not establish session. Continuing with limited extraction...")
+        self.sync_browser_session(driver.get_cookies(), driver.execute_script("return navigator.userAgent"))
+        return driver
+
+    def sync_browser_session(self, cookies, user_agent):
+        """Share a browser's cookies and user agent with the HTTP client"""
+        for cookie in cookies:
+            self.fetcher.session.cookies.set(cookie['name'], cookie['value'],
+                                             domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        self.fetcher.session.headers['User-Agent'] = user_agent
+
+    @staticmethod
+    def is_usable_page(response):
+        """A plain HTTP response can stand in for the browser unless it is a security check"""
+        return (response.status_code == 200
+                and not is_security_check(response.content.decode('utf-8', errors='replace')))
+
+    def fetch_with_http_client(self, pid, url):
+        """Fetch a person page without the browser; returns None when the browser is needed"""
+        try:
+            response = self.fetcher.fetch(url, accept=self.is_usable_page)
+        except requests.RequestException as e:
+            print(f"  Person {pid}: HTTP fetch failed ({e}), falling back to browser")
+            return None
+        page_source = response.content.decode('utf-8', errors='replace')
+        if response.status_code == 200 and is_security_check(page_source):
+            # The fetcher counted the 200 as a success; a security check means slow down
+            delay = self.scheduler.record_throttle()
+            print(f"  Person {pid}: CAPTCHA over HTTP, backing off {delay:.0f}s and falling back to browser")
+            return None
+        if not self.is_usable_page(response):
+            print(f"  Person {pid}: HTTP response not usable (status {response.status_code}), "
+                  f"falling back to browser")
+            return None
+        self.content_hashes[pid] = content_hash(page_source)
+        return page_source
+
+    def fetch_person_page(self, pid, use_http_client=True):
+        """Return the page source for a person, "BLOCKED" or None
+
+        Pages come from the cache when fresh, then from the lightweight HTTP client, and only
+        fall back to the browser when the HTTP response is not a usable person page.
+        """
         max_retries = 3
-        
+        url = self.person_url_template.format(pid=pid)
+
+        # Pages cached within the TTL are served straight from disk
+        cached = self.cache.lookup(url)
+        if cached is not None and cached.fresh:
+            page_source = cached.body.decode('utf-8', errors='replace')
+            self.content_hashes[pid] = content_hash(page_source)
+            return page_source
+
+        if use_http_client:
+            page_source = self.fetch_with_http_client(pid, url)
+            if page_source is not None:
+                return page_source
+
         for attempt in range(max_retries):
             try:
-                # Random delay to avoid detection
-                time.sleep(random.uniform(1, 3))
-                
-                url = f"https://saikura.tribalpages.com/tribe/browse?userid=saikura&view=0&pid={pid}"
-                self.driver.get(url)
-                time.sleep(2)
+                # The pool paces page loads with the shared scheduler
+                page = self.browser_pool.fetch(url)
                 
                 # Check for CAPTCHA
-                if "TribalPages Security" in self.driver.title:
-                    print(f"  Person {pid}: CAPTCHA block on attempt {attempt + 1}")
+                if is_security_check(page.title) or is_security_check(page.page_source):
+                    delay = self.scheduler.record_throttle()
+                    print(f"  Person {pid}: CAPTCHA block on attempt {attempt + 1}, backing off {delay:.0f}s")
                     if attempt < max_retries - 1:
-                        # Wait longer between retries
-                        time.sleep(30)
                         continue
                     else:
                         return "BLOCKED"
                 
-                # Check if valid person page
-                page_source = self.driver.page_source
-                if len(page_source) < 2000 or "Person not found" in page_source:
-                    return "NOT_FOUND"
-                
-                # Parse person data
-                person_data = self.parse_person_page(pid, page_source)
-                return person_data
+                self.scheduler.record_success(page.latency)
+                self.cache.store(url, page.page_source.encode('utf-8'))
+                self.content_hashes[pid] = content_hash(page.page_source)
+                # Cookies set while browsing (e.g. after a solved check) let the HTTP client resume
+                self.sync_browser_session(page.cookies, page.user_agent)
+                return page.page_source
                 
             except Exception as e:
+                self.scheduler.record_error()
                 print(f"  Error on attempt {attempt + 1}: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(5)
                     continue
                 else:
                     return None
         
         return None
+
+    @staticmethod
+    def guarded(extract):
+        """Wrap an extraction so an unexpected error fails only its own pid"""
+        def run(pid):
+            try:
+                return extract(pid)
+            except Exception as e:
+                print(f"  Person {pid}: extraction failed ({e!r})")
+                return "FAILED"
+        return run
+
+    def resilient_extract_person(self, pid):
+        """Extract person data with multiple retry strategies"""
+        page_source = self.fetch_person_page(pid)
+        if page_source is None or page_source == "BLOCKED":
+            return page_source
+        return self.parse_page_source(pid, page_source)
     
+    def parse_page_source(self, pid, page_source):
+        """Check that a page is a valid person page and parse it"""
+        return parse_page_source(pid, page_source)
+
     def parse_person_page(self, pid, page_source):
         """Parse person page for detailed information"""
-        tree = html.fromstring(page_source)
-        
-        person_data = {
-            'pid': pid,
-            'name': None,
-            'birth_date': None,
-            'death_date': None,
-            'gender': None,
-            'father': None,
-            'mother': None,
-            'spouse': None,
-            'children': [],
-            'photos': [],
-            'additional_info': {}
-        }
-        
-        # Extract name from page title
-        title = self.driver.title
-        if " - " in title and "Family Tree" in title:
-            name_part = title.split(" - ")[0].strip()
-            if name_part and len(name_part) > 2 and "Security" not in name_part:
-                person_data['name'] = name_part
-        
-        # Extract all text for analysis
-        all_text = ' '.join(tree.xpath("//text()"))
-        
-        # Extract family relationships
-        family_links = tree.xpath("//a[contains(@href, 'view=0&pid=')]")
-        for link in family_links:
-            href = link.get('href', '')
-            name = link.text or ''
-            if name and href and 'pid=' in href:
-                related_pid_match = re.search(r'pid=(\d+)', href)
-                if related_pid_match:
-                    related_pid = int(related_pid_match.group(1))
-                    if related_pid != pid:
-                        person_data['children'].append({
-                            'name': name.strip(),
-                            'pid': related_pid
-                        })
-        
-        # Extract birth date
-        birth_patterns = [
-            r'born[:\s]*(\w+\s+\d{1,2},?\s+\d{4})',
-            r'birth[:\s]*(\w+\s+\d{1,2},?\s+\d{4})',
-            r'born[:\s]*(\d{1,2}[-/]\d{1,2}[-/]\d{4})',
-            r'born[:\s]*(\d{4})'
-        ]
-        
-        for pattern in birth_patterns:
-            match = re.search(pattern, all_text, re.IGNORECASE)
-            if match:
-                person_data['birth_date'] = match.group(1)
-                break
-        
-        # Extract death date
-        death_patterns = [
-            r'died[:\s]*(\w+\s+\d{1,2},?\s+\d{4})',
-            r'death[:\s]*(\w+\s+\d{1,2},?\s+\d{4})',
-            r'died[:\s]*(\d{1,2}[-/]\d{1,2}[-/]\d{4})',
-            r'died[:\s]*(\d{4})'
-        ]
-        
-        for pattern in death_patterns:
-            match = re.search(pattern, all_text, re.IGNORECASE)
-            if match:
-                person_data['death_date'] = match.group(1)
-                break
-        
-        # Extract photos
-        img_elements = tree.xpath("//img[contains(@src, 'photo') or contains(@src, 'saikura')]")
-        for img in img_elements:
-            src = img.get('src', '')
-            if src and 'saikura' in src:
-                person_data['photos'].append(src)
-        
-        return person_data
+        return parse_person_page(pid, page_source)
     
-    def resilient_full_extraction(self):
-        """Main extraction method with resilience strategies"""
+    def refresh_person(self, pid):
+        """Re-extract a person only if their page is new or its content hash changed"""
+        previous_hash = self.content_hashes.get(pid)
+        page_source = self.fetch_person_page(pid)
+        if page_source is None or page_source == "BLOCKED":
+            return page_source
+        if pid in self.all_people and self.content_hashes.get(pid) == previous_hash:
+            return "UNCHANGED"
+        return self.parse_page_source(pid, page_source)
+
+    def load_existing_database(self):
+        """Load a previous extraction so an incremental run can merge into it"""
+        filename = self.database + ".ndjson"
+        if os.path.exists(filename):
+            for record in iter_records(filename):
+                self.all_people[record['pid']] = record['person']
+                if record.get('content_hash'):
+                    self.content_hashes[record['pid']] = record['content_hash']
+        else:
+            filename = self.database + ".json"
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                print(f"No existing database at {filename}, starting from scratch")
+                return
+            self.all_people = {int(pid): person for pid, person in data.get('people', {}).items()}
+            self.content_hashes = {int(pid): h for pid, h in data.get('content_hashes', {}).items()}
+        print(f"Loaded {len(self.all_people)} people from {filename}")
+
+    def stream_person(self, pid):
+        """Append a completed person to the newline-delimited database being written"""
+        self.stream.write(pid, self.all_people[pid], self.content_hashes.get(pid))
+        self.streamed.add(pid)
+
+    def replay_journal(self):
+        """Restore the pids completed by an interrupted run, returned in the order they finished
+
+        Pids that failed are left out so the resumed crawl tries them again.
+        """
+        completed = {}
+        for record in self.journal.replay():
+            pid = record['pid']
+            if record['status'] == "FAILED":
+                continue
+            completed[pid] = True
+            if record['status'] in ("SUCCESS", "UNCHANGED"):
+                self.all_people[pid] = record['data']
+            elif record['status'] == "NOT_FOUND":
+                self.all_people.pop(pid, None)
+            if record.get('content_hash'):
+                self.content_hashes[pid] = record['content_hash']
+        return list(completed)
+
+    @staticmethod
+    def related_pids(person_data):
+        """Pids linked from a person page"""
+        return [link['pid'] for link in person_data.get('children', []) if link.get('pid')]
+
+    def resilient_full_extraction(self, seed_pids=(1,), incremental=False, resume=False):
+        """Main extraction method with resilience strategies
+
+        Pids are crawled breadth-first from seed_pids, following the person links found on
+        each page, so exactly the reachable part of the tree is requested once.
+
+        With incremental=True the existing database is loaded first and only pids that were
+        never captured or whose page content hash changed are re-parsed and merged back in.
+
+        Every completed pid is appended to the checkpoint journal; with resume=True the journal
+        of an interrupted run is replayed and the crawl continues with the remaining pids.
+        """
         print("Starting Resilient Saikura Family Extraction")
         print("=" * 60)
-        
-        if not self.driver:
-            self.setup_driver()
-        
-        # Try to establish session
-        if not self.try_establish_session():
-            print("Could not establish session. Continuing with limited extraction...")
-        
-        # Use all possible PIDs to find the 181 family members
-        print("Starting systematic extraction of all family members...")
-        all_pids = list(range(1, 201))  # PIDs 1-200 to capture all 181 people
+
+        if incremental:
+            self.load_existing_database()
+        
+        completed = self.replay_journal() if resume else []
+        if resume:
+            print(f"Resumed {len(completed)} completed pids from {self.journal.filename}")
+        self.journal.open(resume=resume)
+        self.stream = RecordWriter(self.database + ".ndjson.partial")
+        self.streamed = set()
+
+        print(f"Starting frontier crawl from {len(seed_pids)} seed(s)...")
+        visited = set(completed)
+        frontier = deque(pid for pid in seed_pids if pid not in visited)
+        visited.update(seed_pids)
+        for pid in completed:
+            for related_pid in self.related_pids(self.all_people.get(pid, {})):
+                if related_pid not in visited:
+                    visited.add(related_pid)
+                    frontier.append(related_pid)
+        requeued_blocks = set()
+        checked = 0
         
         successful_extractions = 0
         blocked_count = 0
         not_found_count = 0
-        
-        for i, pid in enumerate(all_pids):
-            print(f"Processing person {pid} ({i+1}/{len(all_pids)})...")
-            
-            result = self.resilient_extract_person(pid)
-            
-            if result == "BLOCKED":
-                blocked_count += 1
-                print(f"  BLOCKED (total blocks: {blocked_count})")
-                
-                # If too many blocks, take a longer break
-                if blocked_count % 10 == 0:
-                    print(f"Taking a 60-second break after {blocked_count} blocks...")
-                    time.sleep(60)
+        unchanged_count = 0
+        failed_count = 0
+
+        extract = self.guarded(self.refresh_person if incremental else self.resilient_extract_person)
+        in_flight = {}
+        
+        # Workers fetch and parse; results are merged and the frontier grown on this thread only
+        with ThreadPoolExecutor(max_workers=self.browser_workers) as executor:
+            while frontier or in_flight:
+                while frontier and len(in_flight) < self.browser_workers:
+                    pid = frontier.popleft()
+                    in_flight[executor.submit(extract, pid)] = pid
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    pid = in_flight.pop(future)
+                    result = future.result()
+                    checked += 1
+                    print(f"Processed person {pid} ({checked}/{checked + len(frontier) + len(in_flight)})...")
+                    discovered = None
                     
-            elif result == "NOT_FOUND":
-                not_found_count += 1
-                print("  Not found")
-                
-            elif result:
-                self.all_people[pid] = result
-                successful_extractions += 1
-                name = result.get('name', 'Unknown')
-                connections = len(result.get('children', []))
-                print(f"  SUCCESS: {name} ({connections} connections)")
-                blocked_count = 0  # Reset block counter on success
-            
-            # Progress update
-            if (i + 1) % 25 == 0:
-                print(f"\nPROGRESS: {i+1}/{len(all_pids)} checked")
-                print(f"  Successful: {successful_extractions}")
-                print(f"  Blocked: {blocked_count}")
-                print(f"  Not found: {not_found_count}")
+                    if result == "UNCHANGED":
+                        unchanged_count += 1
+                        print("  Unchanged")
+                        discovered = self.related_pids(self.all_people[pid])
+                        self.journal.record(pid, "UNCHANGED", self.all_people[pid], self.content_hashes.get(pid))
+                        self.stream_person(pid)
+
+                    elif result == "BLOCKED":
+                        blocked_count += 1
+                        print(f"  BLOCKED (total blocks: {blocked_count})")
+
+                        # A blocked page hides its links, so give it one more chance at the end
+                        if pid not in requeued_blocks:
+                            requeued_blocks.add(pid)
+                            frontier.append(pid)
+                            
+                    elif result == "FAILED":
+                        failed_count += 1
+                        self.journal.record(pid, "FAILED")
+
+                    elif result == "NOT_FOUND":
+                        not_found_count += 1
+                        self.all_people.pop(pid, None)
+                        print("  Not found")
+                        self.journal.record(pid, "NOT_FOUND")
+                        
+                    elif result:
+                        self.all_people[pid] = result
+                        successful_extractions += 1
+                        name = result.get('name', 'Unknown')
+                        connections = len(result.get('children', []))
+                        print(f"  SUCCESS: {name} ({connections} connections)")
+                        blocked_count = 0  # Reset block counter on success
+                        discovered = self.related_pids(result)
+                        self.journal.record(pid, "SUCCESS", result, self.content_hashes.get(pid))
+                        self.stream_person(pid)
+
+                    if discovered:
+                        for related_pid in discovered:
+                            if related_pid not in visited:
+                                visited.add(related_pid)
+                                frontier.append(related_pid)
+                    
+                    # Progress update
+                    if checked % 25 == 0:
+                        print(f"\nPROGRESS: {checked} checked, {len(frontier)} in frontier")
+                        print(f"  Successful: {successful_extractions}")
+                        print(f"  Blocked: {blocked_count}")
+                        print(f"  Not found: {not_found_count}")
+                        print(f"  Failed: {failed_count}")
+                        if incremental:
+                            print(f"  Unchanged: {unchanged_count}")
         
         print(f"\nExtraction complete!")
         print(f"Successfully extracted {successful_extractions} family members")
+        if incremental:
+            print(f"Unchanged since last run: {unchanged_count}")
         print(f"Total blocks encountered: {blocked_count}")
+        if failed_count:
+            print(f"Failed with errors: {failed_count}")
         
         # Save results
+        self.journal.close()
         self.save_complete_database()
+        self.journal.discard()
         
         return self.all_people
     
     def save_complete_database(self):
         """Save the complete Saikura family database"""
-        output = {
+        metadata = {
             "extraction_date": "2025-10-04",
             "family_name": "Saikura Family Tree - Resilient Extraction",
-            "extraction_method": "Resilient multi-strategy extraction",
-            "total_people_extracted": len(self.all_people),
-            "people": {}
+            "extraction_method": "Resilient multi-strategy extraction"
         }
         
-        # Convert to string keys for JSON
-        for pid, person_data in self.all_people.items():
-            output["people"][str(pid)] = person_data
-        
-        # Save main database
-        with open("SAIKURA_RESILIENT_FAMILY_DATABASE.json", "w", encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        # People carried over from a previous run or the journal were not streamed during the crawl
+        if self.stream is None:
+            self.stream = RecordWriter(self.database + ".ndjson.partial")
+        for pid in sorted(self.all_people):
+            if pid not in self.streamed:
+                self.stream_person(pid)
+        self.stream.close()
+        os.replace(self.stream.filename, self.database + ".ndjson")
+        
+        # The indented JSON remains available as an export
+        export_pretty_json(self.database + ".ndjson", self.database + ".json", metadata)
+
+        # Mirror the run into the indexed SQLite store in one transaction
+        self.store.upsert_people((pid, person, self.content_hashes.get(pid))
+                                 for pid, person in sorted(self.all_people.items()))
+        self.store.delete_people([pid for pid in self.store.pids() if pid not in self.all_people])
+
+        # Deduplicated parent/child graph with every name seen for each pid
+        graph = RelationshipGraph.from_people(self.all_people.values())
+        graph.save(self.database + ".graph.json")
         
         # Create detailed summary
         people_with_names = [p for p in self.all_people.values() if p.get('name')]
@@ -320,22 +498,39 @@ class ResilientSaikuraExtractor:
             json.dump(summary, f, indent=2)
         
         print(f"\n*** RESILIENT SAIKURA FAMILY DATABASE COMPLETE! ***")
-        print(f"File saved: SAIKURA_RESILIENT_FAMILY_DATABASE.json")
+        print(f"Files saved: {self.database}.ndjson, {self.database}.json, {self.store.filename}, "
+              f"{self.database}.graph.json")
         print(f"Total people: {len(self.all_people)}")
         print(f"People with names: {len(people_with_names)}")
         print(f"People with birth dates: {len(people_with_births)}")
         print(f"People with death dates: {len(people_with_deaths)}")
         print(f"People with photos: {len(people_with_photos)}")
+        print(f"Distinct relationships: {graph.edge_count()}")
     
     def close_browser(self):
         """Close browser"""
-        if self.driver:
-            self.driver.quit()
+        self.fetcher.close()
+        self.store.close()
+        if self.browser_pool.workers:
+            self.browser_pool.close()
             print("Browser closed.")
 
 
 def main():
-    extractor = ResilientSaikuraExtractor()
+    parser = argparse.ArgumentParser(description="Extract the Saikura family tree")
+    parser.add_argument("--incremental", action="store_true",
+                        help="merge into the existing database, re-parsing only new or changed pages")
+    parser.add_argument("--seed", type=int, action="append", dest="seeds",
+                        help="pid to start crawling from (repeatable, default: 1)")
+    parser.add_argument("--resume", action="store_true",
+                        help="replay the checkpoint journal of an interrupted run and continue it")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of pages fetched in parallel, each browser with its own profile")
+    parser.add_argument("--recycle-after", type=int, default=50,
+                        help="restart each browser after this many pages to cap memory growth")
+    args = parser.parse_args()
+
+    extractor = ResilientSaikuraExtractor(browser_workers=args.workers, recycle_after=args.recycle_after)
     
     try:
         print("RESILIENT SAIKURA FAMILY EXTRACTION")
@@ -344,7 +539,8 @@ def main():
         print("Please be ready to solve CAPTCHAs when they appear.")
         print("=" * 60)
         
-        result = extractor.resilient_full_extraction()
+        result = extractor.resilient_full_extraction(seed_pids=args.seeds or [1], incremental=args.incremental,
+                                                     resume=args.resume)
         
         print(f"\n*** RESILIENT EXTRACTION COMPLETE! ***")
         print(f"Successfully extracted {len(result)} Saikura family members")
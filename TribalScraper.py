@@ -1,62 +1,103 @@
-from xml import etree
-
-from lxml import html
-import requests
-from typing import Dict, List
+from lxml import etree, html
+from typing import Dict, Iterable, List
 
 from Children import Children
 from FamilyGroup import FamilyGroup
+from FamilyTree import FamilyTree
 from Gender import Gender
 from Marriage import Marriage
-from Person import Person
+from PageFetcher import PageFetcher
+from Person import ROWS, Person
+
+FAMILY_CELLS = etree.XPath("/html/body/center/table/tr/td")
+SECTION_LABEL = etree.XPath("tr/td[position()=1]/b/text()")
 
 
 def trim(string: str):
     return string.replace('\xa0', '')
 
 
+def parse_family_page(content, family_tree: FamilyTree) -> List[FamilyGroup]:
+    """Add the people and family groups in one family-group report page to family_tree
+
+    Returns the page's groups. Nothing is fetched; call family_tree.resolve() once all
+    pages are added to link children to their parents.
+    """
+    family_groups: List[FamilyGroup] = []
+    tree = html.fromstring(content)
+    # Single pass over the report cells; each section table's rows are listed once
+    # and shared with the Person parser
+    for cell in FAMILY_CELLS(tree):
+        if cell.find("b") is not None:
+            family_group: FamilyGroup = FamilyGroup()
+            family_groups.append(family_group)
+            family_tree.family_groups.append(family_group)
+            continue
+        table = cell.find("table")
+        if table is None:
+            continue
+        # The label is the first bold leading cell in any row, not necessarily the first row
+        labels = SECTION_LABEL(table)
+        if not labels:
+            continue
+        rows = ROWS(table)
+        name = trim(labels[0])
+        if name == "Wife":
+            w = Person(table, None, rows)
+            w.gender = Gender.FEMALE
+            family_group.wife_pid = family_tree.add_person(w)
+
+        elif name == "Husband":
+            h = Person(table, None, rows)
+            h.gender = Gender.MALE
+            family_group.husband_pid = family_tree.add_person(h)
+
+        elif name == "Children":
+            family_group.child_pids.extend(family_tree.add_person(child) for child in Children(table))
+    return family_groups
+
+
 class TribalScraper:
     url_template = r'https://saikura.tribalpages.com/tribe/browse?userid=saikura&view=77&reporttype=4&pid='
     people: Dict[str, Person]
     wives: Dict[str, Marriage]
     husbands: Dict[str, Marriage]
 
-    def __init__(self):
+    def __init__(self, fetcher: PageFetcher = None, url_template: str = None):
         self.start = 1
-        self.family_groups: List[FamilyGroup] = []
+        self.tree = FamilyTree()
+        self.fetcher = fetcher or PageFetcher()
+        self.url_template = url_template or TribalScraper.url_template
+
+    @property
+    def family_groups(self) -> List[FamilyGroup]:
+        return self.tree.family_groups
+
+    def url_for(self, pid: int) -> str:
+        return self.url_template + str(pid)
 
     def parse(self, pid: int):
-        url = TribalScraper.url_template + str(pid)
-        page = requests.get(url)
-        tree = html.fromstring(page.content)
-        rows = tree.xpath("/html/body/center/table/tr/td")
-        for row in rows:
-            create_new = row.xpath("b")
-            tables = row.xpath("table")
-            if len(create_new) > 0:
-                family_group: FamilyGroup = FamilyGroup()
-                self.family_groups.append(family_group)
-            elif len(tables) > 0:
-                table = tables[0]
-                name = trim(table.xpath("tr/td[position()=1]/b/text()")[0])
-                if name == "Wife":
-                    w = Person(table, None)
-                    w.gender = Gender.FEMALE
-                    family_group.wife = w
-
-                if name == "Husband":
-                    h = Person(table, None)
-                    h.gender = Gender.MALE
-                    family_group.husband = h
-
-                if name == "Children":
-                    c = Children(table)
-                    family_group.children = c
+        page = self.fetcher.fetch(self.url_for(pid))
+        self.parse_page(page.content)
+        self.tree.resolve()
+
+    def parse_many(self, pids: Iterable[int]):
+        """Fetch family-group pages concurrently and parse them in pid order"""
+        for url, page, error in self.fetcher.fetch_many(self.url_for(pid) for pid in pids):
+            if error is not None:
+                print(f"Error fetching {url}: {error}")
+                continue
+            self.parse_page(page.content)
+        self.tree.resolve()
+
+    def parse_page(self, content):
+        parse_family_page(content, self.tree)
 
 
 def main():
-    scraper = TribalScraper()
-    scraper.parse(34)
+    with PageFetcher() as fetcher:
+        scraper = TribalScraper(fetcher)
+        scraper.parse(34)
 
 
 if __name__ == "__main__":
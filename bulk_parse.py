@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Bulk-parse an archive of saved pages on all cores
+Reads a directory of saved HTML, a zip/tar archive or a page cache directory and
+streams the parsed records to a single newline-delimited JSON file
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from PageCache import PageCache
+from PersonPage import content_hash, parse_page_source
+from FamilyTree import FamilyTree
+from TribalScraper import parse_family_page
+
+PAGE_SUFFIXES = ('.html', '.htm', '.html.gz', '.htm.gz')
+VIEWS = {'person': '0', 'family': '77'}
+
+
+def pid_from_filename(name):
+    match = re.search(r'(\d+)', os.path.basename(name))
+    return int(match.group(1)) if match else None
+
+
+def iter_sources(source, kind):
+    """Yield (pid, path, data) for every saved page; data is only read up front for archives"""
+    if os.path.isdir(source) and os.path.exists(os.path.join(source, 'index.sqlite')):
+        cache = PageCache(source)
+        for url, path in cache.entries():
+            query = parse_qs(urlsplit(url).query)
+            if query.get('view', [None])[0] == VIEWS[kind] and query.get('pid'):
+                yield int(query['pid'][0]), path, None
+        cache.close()
+    elif os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(PAGE_SUFFIXES):
+                    yield pid_from_filename(name), os.path.join(root, name), None
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in archive.namelist():
+                if name.lower().endswith(PAGE_SUFFIXES):
+                    yield pid_from_filename(name), name, archive.read(name)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(PAGE_SUFFIXES):
+                    yield pid_from_filename(member.name), member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"Don't know how to read pages from {source}")
+
+
+def read_page(path, data):
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+    if path.endswith('.gz'):
+        data = gzip.decompress(data)
+    return data
+
+
+def parse_one(kind, pid, content):
+    """Record for one page, or None for a person page that does not exist"""
+    if kind == 'person':
+        page_source = content.decode('utf-8', errors='replace')
+        result = parse_page_source(pid, page_source)
+        if result == "NOT_FOUND":
+            return None
+        # Same record layout as the extractor's newline-delimited database
+        return {
+            'pid': pid,
+            'content_hash': content_hash(page_source),
+            'person': result
+        }
+    family_tree = FamilyTree()
+    parse_family_page(content, family_tree)
+    family_tree.resolve()
+    return {
+        'pid': pid,
+        'people': [person.to_dict() for person in family_tree.people.values()],
+        'family_groups': [group.to_dict() for group in family_tree.family_groups]
+    }
+
+
+def parse_chunk(kind, chunk):
+    """Parse one chunk of pages in a worker process; returns (records, [(path, error)])
+
+    A page that cannot be read or parsed is reported as failed without losing the
+    rest of its chunk.
+    """
+    records = []
+    failed = []
+    for pid, path, data in chunk:
+        try:
+            record = parse_one(kind, pid, read_page(path, data))
+        except Exception as e:
+            failed.append((path, repr(e)))
+            continue
+        if record is not None:
+            records.append(record)
+    return records, failed
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_parse(source, output, kind='person', workers=None, chunksize=64):
+    """Fan parsing out over a process pool, writing records in input order from this process"""
+    workers = workers or os.cpu_count() or 1
+    started = time.time()
+    written = 0
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, open(output, 'w', encoding='utf-8') as out:
+        # Keep a bounded window of chunks in flight so huge archives are not read into memory at once
+        pending = deque()
+
+        def write(result):
+            records, failures = result
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            for path, error in failures:
+                print(f"Failed to parse {path}: {error}")
+            failed.extend(failures)
+            return len(records)
+
+        for chunk in chunked(iter_sources(source, kind), chunksize):
+            pending.append(executor.submit(parse_chunk, kind, chunk))
+            if len(pending) >= workers * 2:
+                written += write(pending.popleft().result())
+        while pending:
+            written += write(pending.popleft().result())
+
+    print(f"Parsed {written} {kind} records from {source} in {time.time() - started:.1f}s using {workers} workers")
+    if failed:
+        print(f"{len(failed)} pages could not be parsed")
+    print(f"Output saved: {output}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-parse saved TribalPages pages on all cores")
+    parser.add_argument("source", help="directory of saved HTML, zip/tar archive, or page cache directory")
+    parser.add_argument("--kind", choices=sorted(VIEWS), default="person",
+                        help="person pages (view=0) or family group reports (view=77)")
+    parser.add_argument("--output", default="BULK_PARSED_PAGES.ndjson")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=64, help="pages handed to a worker at a time")
+    args = parser.parse_args()
+
+    bulk_parse(args.source, args.output, kind=args.kind, workers=args.workers, chunksize=args.chunksize)
+
+
+if __name__ == "__main__":
+    main()
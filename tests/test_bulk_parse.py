@@ -0,0 +1,18 @@
+import gzip
+
+from bulk_parse import iter_sources, parse_chunk
+from test_tribal_scraper import FAMILY_PAGE
+
+
+def test_a_bad_page_does_not_lose_its_chunk(tmp_path):
+    for pid in (1, 2):
+        (tmp_path / f"family_{pid}.html.gz").write_bytes(gzip.compress(FAMILY_PAGE.encode('utf-8')))
+    broken = tmp_path / "family_3.html.gz"
+    broken.write_bytes(b"not gzip")
+    chunk = list(iter_sources(str(tmp_path), 'family'))
+
+    records, failed = parse_chunk('family', chunk)
+
+    assert [record['pid'] for record in records] == [1, 2]
+    assert records[0]['family_groups'] == [{'husband_pid': 1, 'wife_pid': 2, 'child_pids': [3, 4]}]
+    assert [path for path, _ in failed] == [str(broken)]
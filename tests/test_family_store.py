@@ -0,0 +1,22 @@
+from FamilyStore import FamilyStore
+
+PERSON = {'pid': 4, 'name': 'Ali Hassan', 'children': [
+    {'name': 'Hassan Ahmed', 'pid': 5, 'role': 'father'},
+    {'name': 'Aishath Moosa', 'pid': 8, 'role': 'spouse'},
+    {'name': 'Ibrahim Ali', 'pid': 6, 'role': 'child'},
+    {'name': 'Mariyam Ali', 'pid': 7},
+]}
+
+
+def test_relationships_keep_their_role():
+    store = FamilyStore(":memory:")
+    store.upsert_people([(4, PERSON, None)])
+
+    assert store.children_of(4) == [(6, 'Ibrahim Ali'), (7, 'Mariyam Ali')]
+    assert store.parents_of(6) == [4]
+    assert store.parents_of(5) == []
+    assert list(store.child_names_by_parent()) == [(4, ['Ibrahim Ali', 'Mariyam Ali'])]
+    assert sorted(store.linked_names()) == [(5, 'Hassan Ahmed'), (6, 'Ibrahim Ali'), (7, 'Mariyam Ali'),
+                                            (8, 'Aishath Moosa')]
+    assert [link.get('role') for link in store.get_person(4)['children']] == ['father', 'spouse', None, None]
+    store.close()
@@ -0,0 +1,75 @@
+from GedcomReader import iter_records, load_gedcom, parse_gedcom, split_line
+
+GEDCOM = """0 HEAD
+1 CHAR UTF-8
+0 @I3@ INDI
+1 NAME Kid /Doe/
+1 FAMC @F1@
+1 BIRT
+2 PLAC Male'
+2 DATE 1 JAN 1990
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I4@
+0 @I1@ INDI
+1 NAME Johnny
+1 NAME John /Doe/
+1 SEX M 
+1 FAMS @F1@
+1 DEAT
+2 DATE 2000
+0 @I2@ INDI
+1 NAME Hawwa
+2 CONC  /Didi/
+1 SEX F
+1 FAMS @F1@
+1 NOTE First line
+2 CONT second line
+0 @I4@ INDI
+1 SEX F
+1 FAMC @F1@
+0 TRLR
+"""
+
+
+def write(tmp_path, text):
+    path = tmp_path / "tree.ged"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_cont_and_conc_are_folded(tmp_path):
+    filename = write(tmp_path, GEDCOM)
+    people = parse_gedcom(filename)
+    assert people['I2']['name'] == 'Hawwa Didi'
+    hawwa = next(record for record in iter_records(filename, ('INDI',)) if record.xref == 'I2')
+    assert hawwa.value_of('NOTE') == 'First line\nsecond line'
+
+
+def test_split_line_keeps_leading_value_spaces():
+    assert split_line('2 CONC  /Didi/') == (2, None, 'CONC', ' /Didi/')
+    assert split_line('0 @I1@ INDI') == (0, 'I1', 'INDI', '')
+    assert split_line('not a line') is None
+
+
+def test_people_are_linked_through_families(tmp_path):
+    people = parse_gedcom(write(tmp_path, GEDCOM))
+    assert set(people) == {'I1', 'I2', 'I3'}    # I4 has no name
+    john = people['I1']
+    assert john['name'] == 'John Doe'           # the last NAME wins
+    assert john['sex'] == 'M'
+    assert john['death'] == '2000'
+    assert john['children'] == ['Kid Doe']
+    kid = people['I3']
+    assert kid['birth'] == '1 JAN 1990'
+    assert (kid['father'], kid['mother'], kid['famc']) == ('John Doe', 'Hawwa Didi', 'F1')
+
+
+def test_forward_references_resolve_to_indexes(tmp_path):
+    tables = load_gedcom(write(tmp_path, GEDCOM))
+    kid = tables.person_index['I3']
+    assert tables.person_ids[tables.father(kid)] == 'I1'
+    assert tables.person_ids[tables.mother(kid)] == 'I2'
+    assert [tables.person_ids[i] for i in tables.children(tables.person_index['I2'])] == ['I3', 'I4']
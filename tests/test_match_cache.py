@@ -0,0 +1,52 @@
+import NameMatcher as name_matcher
+from MatchCache import MatchCache
+from NameMatcher import NameMatcher
+from NameNormalizer import normalize_name
+
+NAMES = ["Aminath Ali", "Ibrahim Hassan", "Mariyam Moosa", "Aishath Ali"]
+
+
+class CountingSequenceMatcher(name_matcher.SequenceMatcher):
+    calls = []
+
+    def quick_ratio(self):
+        self.calls.append((self.a, self.b))
+        return super().quick_ratio()
+
+
+def test_decisions_are_reused_across_runs(tmp_path, monkeypatch):
+    filename = str(tmp_path / "cache.sqlite")
+    with MatchCache(NameMatcher.VERSION, filename) as scores:
+        first = NameMatcher(NAMES, normalize=normalize_name, scores=scores).match("Aaminath Ali", 0.7, k=2)
+
+    monkeypatch.setattr(name_matcher, "SequenceMatcher", None)
+    with MatchCache(NameMatcher.VERSION, filename) as scores:
+        # Input order does not change the target set
+        again = NameMatcher(reversed(NAMES), normalize=normalize_name, scores=scores).match("Aaminath Ali", 0.7, k=2)
+    assert again == first
+    assert first[0] == ("Aminath Ali", 1.0)
+
+
+def test_rejected_pairs_are_not_rescored(tmp_path, monkeypatch):
+    monkeypatch.setattr(name_matcher, "SequenceMatcher", CountingSequenceMatcher)
+    CountingSequenceMatcher.calls = []
+    filename = str(tmp_path / "cache.sqlite")
+    with MatchCache(NameMatcher.VERSION, filename) as scores:
+        assert NameMatcher(NAMES, normalize=normalize_name, scores=scores).match("Ibrahim Ali", 0.9) == []
+    assert CountingSequenceMatcher.calls
+
+    # A new target set misses the decision cache but still skips the pairs rejected before
+    CountingSequenceMatcher.calls = []
+    with MatchCache(NameMatcher.VERSION, filename) as scores:
+        matcher = NameMatcher(NAMES + ["Hawwa Didi"], normalize=normalize_name, scores=scores)
+        assert matcher.match("Ibrahim Ali", 0.9) == []
+    assert all(target == "hawwa didi" for _, target in CountingSequenceMatcher.calls)
+
+
+def test_memory_is_bounded(tmp_path):
+    with MatchCache("v", str(tmp_path / "cache.sqlite"), max_entries=2, flush_every=3) as scores:
+        for n in range(10):
+            scores.record(("query", f"target {n}"), n / 10)
+        assert len(scores.recent) == 2
+        assert scores.get(("query", "target 0")) == (0.0, True)
+        assert scores.get(("query", "missing")) is None
@@ -0,0 +1,12 @@
+from NameNormalizer import normalize_name
+
+
+def test_latin_accents_and_spellings_are_folded():
+    assert normalize_name("  Aaminath  Zoë ") == normalize_name("Aminath Zoe") == "aminath zoe"
+    assert normalize_name("Didi, Hawwa") == "hawwa didi"
+
+
+def test_marks_on_other_scripts_are_kept():
+    assert normalize_name("ހަސަން") == "ހަސަން"
+    assert normalize_name("ހަސަން") != normalize_name("ހސން")
+    assert normalize_name("مُحَمَّد") == "مُحَمَّد"
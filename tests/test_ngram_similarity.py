@@ -0,0 +1,23 @@
+import pytest
+
+import NgramSimilarity as ngram_similarity
+from Reconciliation import best_matches
+
+TARGETS = ["Yoosuf, Jaufar", "Ismail, Shareefa", "Haleem, Aminath", "Didi, Hawwa", "Fulhu, Ibrahim"]
+QUERIES = ["Jaufar Yusuf", "Shareefa Ismail", "Aaminath Haleem", "Hawwa Didi", "Ibrahim Fulhu", "Zzz Qqq"]
+
+
+def test_missing_numpy_fails_with_install_hint(monkeypatch):
+    monkeypatch.setattr(ngram_similarity, "sparse", None)
+    with pytest.raises(ImportError, match="numpy and scipy"):
+        ngram_similarity.NgramSimilarity(TARGETS)
+
+
+def test_ngram_backend_agrees_with_sequence_backend():
+    pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    sequence = best_matches(QUERIES, TARGETS, 0.6, backend='sequence')
+    ngram = best_matches(QUERIES, TARGETS, 0.6, backend='ngram')
+    assert [match and match[0] for match in ngram] == [match and match[0] for match in sequence]
+    assert sequence[-1] is None and sequence[0][0] == "Yoosuf, Jaufar"
+    assert all(0.6 <= similarity <= 1.0 + 1e-9 for _, similarity in filter(None, ngram))
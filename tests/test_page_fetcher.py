@@ -0,0 +1,100 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from PageFetcher import PageFetcher
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /page?n, /throttled (503 until the third request) and /slow, recording each hit"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((time.monotonic(), self.path, self.client_address))
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            throttled = self.path == "/throttled" and sum(path == "/throttled" for _, path, _ in server.hits) < 3
+        if self.path == "/slow":
+            time.sleep(0.1)
+        body = b"busy" if throttled else f"page {self.path}".encode()
+        self.send_response(503 if throttled else 200)
+        if throttled:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.daemon_threads = True
+    httpd.hits, httpd.in_flight, httpd.peak, httpd.lock = [], 0, 0, threading.Lock()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_connections_are_reused(server):
+    with PageFetcher(max_workers=2, requests_per_second=100, burst=10) as fetcher:
+        for n in range(6):
+            assert fetcher.fetch(url(server, f"/page?{n}")).text == f"page /page?{n}"
+    assert len({client for _, _, client in server.hits}) == 1
+
+
+def test_requests_are_rate_limited(server):
+    with PageFetcher(max_workers=3, requests_per_second=20, burst=1) as fetcher:
+        results = list(fetcher.fetch_many(url(server, f"/page?{n}") for n in range(6)))
+    assert all(error is None for _, _, error in results)
+    starts = [started for started, _, _ in server.hits]
+    # One token up front, then one every 1/20 s
+    assert max(starts) - min(starts) >= 5 / 20 * 0.9
+
+
+def test_throttled_responses_are_retried(server):
+    with PageFetcher(requests_per_second=100, burst=10, max_retries=3) as fetcher:
+        response = fetcher.fetch(url(server, "/throttled"))
+    assert response.status_code == 200
+    assert [path for _, path, _ in server.hits] == ["/throttled"] * 3
+
+
+def test_per_host_concurrency_is_capped(server):
+    with PageFetcher(max_workers=4, max_per_host=2, requests_per_second=100, burst=10) as fetcher:
+        list(fetcher.fetch_many(url(server, "/slow") for _ in range(8)))
+    assert server.peak == 2
+    assert len({client for _, _, client in server.hits}) <= 2
+
+
+def test_rate_can_climb_above_its_start():
+    with PageFetcher(requests_per_second=50) as fetcher:
+        scheduler, _ = fetcher.host_state("http://127.0.0.1/")
+    for _ in range(5):
+        scheduler.record_success(0.01)
+    assert scheduler.max_rate == 100
+    assert scheduler.rate > 50
+
+
+def test_retries_run_out_on_throttling(server):
+    with PageFetcher(requests_per_second=100, burst=10, max_retries=2) as fetcher:
+        with pytest.raises(requests.HTTPError) as error:
+            fetcher.fetch(url(server, "/throttled"))
+    assert error.value.response.status_code == 503
+    assert len(server.hits) == 2
+    with pytest.raises(ValueError):
+        PageFetcher(max_retries=0)
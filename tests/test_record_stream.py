@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+
+import RecordStream
+from FamilyStore import open_store
+from RecordStream import PeopleFile, RecordWriter, export_pretty_json, follow_records, open_people
+
+
+def write_records(filename, pids):
+    with RecordWriter(filename) as writer:
+        for pid in pids:
+            writer.write(pid, {"pid": pid, "name": f"Person {pid}"}, f"hash{pid}")
+
+
+def test_export_is_in_pid_order(tmp_path):
+    ndjson = str(tmp_path / "db.ndjson")
+    write_records(ndjson, [30, 4, 200, 1])
+    export_pretty_json(ndjson, str(tmp_path / "db.json"), {"extraction_date": "2024-01-01"})
+
+    with open(tmp_path / "db.json", encoding='utf-8') as f:
+        data = json.load(f)
+    assert list(data["people"]) == ["1", "4", "30", "200"]
+    assert list(data["content_hashes"]) == ["1", "4", "30", "200"]
+    assert data["total_people_extracted"] == 4
+
+
+def test_legacy_json_is_loaded_once(tmp_path, monkeypatch):
+    filename = tmp_path / "db.json"
+    filename.write_text(json.dumps({"people": {"1": {"pid": 1}, "2": {"pid": 2}}}), encoding='utf-8')
+    loads = []
+    load = json.load
+    monkeypatch.setattr(RecordStream.json, "load", lambda f: loads.append(f) or load(f))
+
+    people = PeopleFile(str(filename))
+    assert [p["pid"] for p in people] == [1, 2]
+    assert people.count() == 2
+    assert [p["pid"] for p in people] == [1, 2]
+    assert len(loads) == 1
+
+
+def test_follow_reads_partial_file_until_renamed(tmp_path):
+    basename = str(tmp_path / "db")
+    partial = basename + ".ndjson.partial"
+    writer = RecordWriter(partial)
+    writer.write(1, {"pid": 1})
+
+    def finish_crawl():
+        time.sleep(0.05)
+        writer.file.write('{"pid": 2, "content_hash": null, ')
+        writer.file.flush()
+        time.sleep(0.05)
+        writer.file.write('"person": {"pid": 2}}\n')
+        writer.write(3, {"pid": 3})
+        writer.close()
+        os.replace(partial, basename + ".ndjson")
+
+    people = open_people(basename, follow=True)
+    thread = threading.Thread(target=finish_crawl)
+    thread.start()
+    pids = [person["pid"] for person in people]
+    thread.join()
+    assert pids == [1, 2, 3]
+    assert not open_people(basename).follow
+
+
+def test_follow_stops_when_idle(tmp_path):
+    filename = str(tmp_path / "db.ndjson.partial")
+    write_records(filename, [1])
+    records = list(follow_records(filename, poll_interval=0.01, idle_timeout=0.05))
+    assert [record["pid"] for record in records] == [1]
+    people = open_people(filename[:-len(".ndjson.partial")], follow=True, idle_timeout=0.05)
+    assert people.idle_timeout == 0.05 and [person["pid"] for person in people] == [1]
+
+
+def test_store_follows_a_crawl_in_progress(tmp_path):
+    basename = str(tmp_path / "db")
+    partial = basename + ".ndjson.partial"
+    write_records(partial, [2, 1])
+    os.replace(partial, basename + ".ndjson")   # an earlier, finished crawl
+    writer = RecordWriter(partial)
+    writer.write(7, {"pid": 7, "name": "Hawwa Didi", "children": []})
+
+    def finish_crawl():
+        time.sleep(0.05)
+        writer.close()
+        os.replace(partial, basename + ".ndjson")
+
+    thread = threading.Thread(target=finish_crawl)
+    thread.start()
+    store = open_store(basename, follow=True)
+    thread.join()
+    assert store.pids() == [7]
+    store.close()
@@ -0,0 +1,63 @@
+import os
+
+from conftest import ROOT
+from RecordStream import open_people
+from RelationshipGraph import CHILD, SPOUSE, RelationshipGraph
+
+
+def test_committed_database_has_no_mutual_or_cyclic_child_edges():
+    graph = RelationshipGraph.from_people(open_people(os.path.join(ROOT, "SAIKURA_RESILIENT_FAMILY_DATABASE")))
+    child = graph.edges[CHILD]
+    # Its links predate roles: edges come from the parents listed at the top of each page
+    assert len(child) >= 200 and len(graph.edges[SPOUSE]) > 0
+    assert graph.rejected == []
+    assert graph.parents(30) == [29, 34] and graph.spouses(29) == [34]
+    assert not any((target, source) in child for source, target in child)
+    for pid in graph.pids:
+        assert not set(graph.ancestors(pid)) & set(graph.descendants(pid))
+        assert pid not in graph.descendants(pid)
+
+
+def test_legacy_pages_link_their_parents():
+    graph = RelationshipGraph.from_people([
+        {'pid': 3, 'name': 'C', 'children': [{'name': 'A', 'pid': 1}, {'name': 'B', 'pid': 2},
+                                             {'name': 'B', 'pid': 2}, {'name': 'A', 'pid': 1},
+                                             {'name': 'D', 'pid': 4}]},
+    ])
+    assert graph.parents(3) == [1, 2]
+    assert graph.spouses(1) == [2]
+    assert graph.children(3) == [] and graph.spouses(3) == []
+
+
+def test_untyped_links_add_aliases_but_no_edges():
+    graph = RelationshipGraph.from_people([
+        {'pid': 1, 'name': 'A', 'children': [{'name': 'B', 'pid': 2}]},
+        {'pid': 2, 'name': 'B', 'children': [{'name': 'A', 'pid': 1}]},
+    ])
+    assert graph.edge_count() == 0
+    assert graph.aliases[2] == ['B']
+
+
+def test_links_are_typed_by_role():
+    graph = RelationshipGraph.from_people([
+        {'pid': 1, 'name': 'Ali', 'children': [{'name': 'Hassan', 'pid': 2, 'role': 'child'},
+                                               {'name': 'Aishath', 'pid': 3, 'role': 'spouse'},
+                                               {'name': 'Ahmed', 'pid': 4, 'role': 'father'},
+                                               {'name': 'Moosa', 'pid': 5, 'role': 'sibling'}]},
+        {'pid': 2, 'name': 'Hassan', 'children': [{'name': 'Ali', 'pid': 1, 'role': 'father'}]},
+    ])
+    assert graph.children(1) == [2]
+    assert graph.parents(1) == [4]
+    assert graph.spouses(1) == [3] and graph.spouses(3) == [1]
+    assert graph.descendants(4) == [1, 2]
+    assert len(graph.edges[SPOUSE]) == 2 and graph.rejected == []
+
+
+def test_mutual_edges_and_cycles_are_rejected():
+    graph = RelationshipGraph()
+    for parent, child in [(1, 2), (2, 1), (1, 3), (3, 4), (4, 1), (4, 5)]:
+        graph.add_edge(CHILD, parent, child)
+    graph.build()
+    assert graph.rejected == [(1, 2), (2, 1), (4, 1)]
+    assert graph.descendants(1) == [3, 4, 5]
+    assert graph.ancestors(1) == []
@@ -0,0 +1,54 @@
+from FamilyTree import FamilyTree
+from TribalScraper import parse_family_page
+
+
+def person_table(label, pid, name, born):
+    return f"""<table>
+<tr><td><b>{label}</b></td><td><b>{name}</b> <a href="browse?userid=saikura&view=0&pid={pid}">view</a></td></tr>
+<tr><td>Born</td><td>{born}</td><td>Male'</td></tr>
+</table>"""
+
+
+def child_row(pid, name, gender):
+    return f"""<tr><td>1</td><td><b>{name}</b> <a href="browse?userid=saikura&view=0&pid={pid}">view</a></td>
+<td><table><tr><td>Sex</td><td>{gender}</td></tr></table></td></tr>"""
+
+
+# The Children section comes before the parents it belongs to
+FAMILY_PAGE = f"""<html><body><center><table>
+<tr><td><b>Family Group</b></td></tr>
+<tr><td><table><tr><td><b>Children</b></td></tr>
+{child_row(3, "Ibrahim Ali", "M")}
+{child_row(4, "Mariyam Ali", "F")}
+</table></td></tr>
+<tr><td>{person_table("Husband", 1, "Ali Hassan", "1 Jan 1950")}</td></tr>
+<tr><td>{person_table("Wife", 2, "Aishath Moosa", "2 Feb 1952")}</td></tr>
+</table></center></body></html>"""
+
+
+def test_children_are_linked_by_pid_whatever_the_section_order():
+    family_tree = FamilyTree()
+    groups = parse_family_page(FAMILY_PAGE, family_tree)
+    family_tree.resolve()
+
+    assert [group.to_dict() for group in groups] == [{'husband_pid': 1, 'wife_pid': 2, 'child_pids': [3, 4]}]
+    people = family_tree.people
+    assert people[1].name == "Ali Hassan" and people[1].born.date == "1 Jan 1950"
+    assert [(people[pid].father_pid, people[pid].mother_pid, str(people[pid].gender)) for pid in (3, 4)] == [
+        (1, 2, "M"), (1, 2, "F")]
+
+
+def test_people_on_several_pages_are_merged():
+    family_tree = FamilyTree()
+    parse_family_page(FAMILY_PAGE, family_tree)
+    parse_family_page(FAMILY_PAGE.replace("pid=4", "pid=5"), family_tree)
+    family_tree.resolve()
+    assert sorted(family_tree.people) == [1, 2, 3, 4, 5]
+    assert len(family_tree.family_groups) == 2
+
+
+def test_section_label_may_follow_a_spacer_row():
+    page = FAMILY_PAGE.replace("<table><tr><td><b>Children</b>", "<table><tr><td></td></tr><tr><td><b>Children</b>")
+    family_tree = FamilyTree()
+    groups = parse_family_page(page, family_tree)
+    assert groups[0].child_pids == [3, 4]